@@ -3,13 +3,27 @@
 import math
 from side_link import SideLink
 from hex_cell_init import HexCellInitializer as initializer
-from hex_dir import HexSideDir, HexVertexDir
+from hex_dir import HexSideDir, HexVertexDir, SIDE_DIR_VERTEX_DIRS
+from side_status import SideStatus
 from cell_faction import CellFaction
 from anti_pair import AntiPair
 from point import Point
 from helpers import checkAllSidesAreUnset
 from constants import COS_60, SQRT3
 
+# Define SideStatus members
+UNSET = int(SideStatus.UNSET)
+ACTIVE = int(SideStatus.ACTIVE)
+BLANK = int(SideStatus.BLANK)
+
+# The side status mask with all six sides set
+ALL_SIDES_MASK = 0b111111
+# The number of set bits of each side status mask
+MASK_COUNT = tuple(bin(mask).count("1") for mask in range(ALL_SIDES_MASK + 1))
+# The side directions of the set bits of each side status mask
+_MASK_DIRS = tuple(tuple(int(sideDir) for sideDir in HexSideDir if mask & (1 << sideDir))
+                   for mask in range(ALL_SIDES_MASK + 1))
+
 
 class HexCell:
     """
@@ -22,6 +36,10 @@ class HexCell:
         reqSides (int): The required number of sides of the cell. Can be None.
     """
 
+    __slots__ = ("id", "row", "col", "numDirty", "sideLength", "center", "reqSides", "reqBlanks",
+                 "faction", "adjCells", "sides", "vertices", "limbs", "sideIds", "activeMask",
+                 "blankMask", "_memoDirOfLimb", "_memoLimbAtVertex", "_memoCaps", "_memoIsFullySet")
+
     def __init__(self, row, col, sideLength, reqSides):
         self.id = f"{row},{col}"
         self.row = row
@@ -30,34 +48,53 @@ class HexCell:
         self.sideLength = sideLength
         self.center = Point()
         self.reqSides = reqSides
+        # The number of required BLANK sides. None if `reqSides` is None.
+        self.reqBlanks = None if reqSides is None else 6 - reqSides
         self.faction = CellFaction.UNKNOWN
+        # Filled in while the board is built, then frozen into tuples by initCell()
         self.adjCells = [None for _ in HexSideDir]
         self.sides = [None for _ in HexSideDir]
         self.vertices = [None for _ in HexVertexDir]
         self.limbs = [None for _ in HexVertexDir]
+        self.sideIds = None  # The ids of the sides, for quick membership checks
+
+        # The ACTIVE and BLANK sides as bitmasks, where bit N is the side at HexSideDir N.
+        # The sides in neither mask are UNSET. Kept up to date by the sides.
+        self.activeMask = 0
+        self.blankMask = 0
 
         # Memoized stuff
         self._memoDirOfLimb = None
+        self._memoLimbAtVertex = None
+        self._memoCaps = [None for _ in HexSideDir]
         self._memoIsFullySet = None
 
     def initCell(self):
         """Initialize the cell memos."""
+        # The board is fully built at this point, so the neighbors never change again
+        self.adjCells = tuple(self.adjCells)
+        self.sides = tuple(self.sides)
+        self.vertices = tuple(self.vertices)
+        self.limbs = tuple(self.limbs)
+        self.sideIds = frozenset(side.id for side in self.sides)
         self._memoDirOfLimb = initializer.getDirOfLimbDict(self)
+        self._memoLimbAtVertex = {vertex.id: limb for vertex, limb in zip(self.vertices, self.limbs)
+                                  if vertex is not None}
 
     def isFullySet(self, memoize=False):
         """Returns true if there are no more UNSET sides remaining in the cell."""
         # If memoizing is enabled, once the cell is fully set, it won't be unset
         if memoize:
-            if not self._memoIsFullySet and self.countUnsetSides() == 0:
+            if not self._memoIsFullySet and self.activeMask | self.blankMask == ALL_SIDES_MASK:
                 self._memoIsFullySet = True
             return self._memoIsFullySet
         # If memoizing is disabled, calculate every time
-        return self.countUnsetSides() == 0
+        return self.activeMask | self.blankMask == ALL_SIDES_MASK
 
     def requiredBlanks(self):
         """Returns the number of required `BLANK` sides.
         Returns None if `reqSides` is None."""
-        return None if self.reqSides is None else 6 - self.reqSides
+        return self.reqBlanks
 
     def remainingReqs(self):
         """Returns the number of remaining `ACTIVE` requirements.
@@ -67,40 +104,29 @@ class HexCell:
 
     def countActiveSides(self):
         """Returns the number of currently `ACTIVE` sides."""
-        count = 0
-        for side in self.sides:
-            if side.isActive():
-                count += 1
-        return count
+        return MASK_COUNT[self.activeMask]
 
     def countBlankSides(self):
         """Returns the number of currently `BLANK` sides."""
-        count = 0
-        for side in self.sides:
-            if side.isBlank():
-                count += 1
-        return count
+        return MASK_COUNT[self.blankMask]
 
     def countUnsetSides(self):
         """Returns the number of currently `UNSET` sides."""
-        count = 0
-        for side in self.sides:
-            if side.isUnset():
-                count += 1
-        return count
+        return MASK_COUNT[ALL_SIDES_MASK ^ (self.activeMask | self.blankMask)]
 
     def getAntiPair(self, vtxDir):
         """Returns an AntiPair if the two sides in the given vertex direction is an anti-pair.
         Returns None if the sides in that vertex is not an anti-pair."""
         # If the limb at the given vertex is none or not active, it isn't an anti-pair
-        if self.limbs[vtxDir] is None or not self.limbs[vtxDir].isActive():
+        limb = self.limbs[vtxDir]
+        if limb is None or limb.status != ACTIVE:
             return None
         # Get the two sides in that vertex
         sideDir1, sideDir2 = vtxDir.connectedSideDirs()
         side1 = self.sides[sideDir1]
         side2 = self.sides[sideDir2]
         # If the limb is active (checked above) and the two sides are unset, it is an anti-pair
-        if side1.isUnset() and side2.isUnset():
+        if side1.status == UNSET and side2.status == UNSET:
             return AntiPair(side1, side2)
         return None
 
@@ -152,8 +178,10 @@ class HexCell:
                      None if there is no limb at that location.
         """
         if vertex is not None:
+            if vertex.id in self._memoLimbAtVertex:
+                return self._memoLimbAtVertex[vertex.id]
             for candidateLimb in vertex.sides:
-                if candidateLimb not in self.sides:
+                if candidateLimb.id not in self.sideIds:
                     return candidateLimb
 
         return None
@@ -177,15 +205,6 @@ class HexCell:
         self.center += Point((deltaX, deltaY))
         self.center += boardCenter
 
-    def registerSide(self, sideDir, hexSide):
-        """Register a side of the cell.
-
-        Args:
-            sideDir (HexSideDir): The direction of the side to be registered.
-            hexSide (HexSide): The side object to be registered.
-        """
-        self.sides[sideDir] = hexSide
-
     def __eq__(self, other):
         return other.row == self.row and other.col == self.col
 
@@ -200,44 +219,46 @@ class HexCell:
 
     def getActiveSides(self):
         """Returns a list of all the `ACTIVE` sides of this cell."""
-        return list(filter(lambda side: side.isActive(), self.sides))
+        return [self.sides[sideDir] for sideDir in _MASK_DIRS[self.activeMask]]
 
     def getBlankSides(self):
         """Returns a list of all the `BLANK` sides of this cell."""
-        return list(filter(lambda side: side.isBlank(), self.sides))
+        return [self.sides[sideDir] for sideDir in _MASK_DIRS[self.blankMask]]
 
-    def getUnsetSides(self):
-        """Returns a list of all the `UNSET` sides of this cell."""
-        return list(filter(lambda side: side.isUnset(), self.sides))
-
-    def getAllSidesExcept(self, *exclusions):
-        """Returns a list of all sides excluding a given list of sides.
+    def getUnsetSides(self, excludeMask=0):
+        """Returns a list of all the `UNSET` sides of this cell.
 
         Args:
-            exclusionList ([HexSide]): A list containing the exceptions.
-
-        Returns:
-            [HexSide]: The list of all sides excluding the given list of sides.
+            excludeMask (int): A side mask of the sides to leave out. Optional.
         """
-        return list(filter(lambda side: side not in exclusions, self.sides))
+        unsetMask = ALL_SIDES_MASK ^ (self.activeMask | self.blankMask)
+        return [self.sides[sideDir] for sideDir in _MASK_DIRS[unsetMask & ~excludeMask]]
 
-    def getAllCellSidesConnectedToSide(self, side):
-        """Returns a list of all sides of the cell which are connected to a given side.
+    def getSideMask(self, sides):
+        """Returns the side mask of the given sides of this cell,
+        where bit N is set if the side at HexSideDir N is given.
 
-        If the given side is part of the cell, it will not be included in the returned list.
+        Args:
+            sides ([HexSide]): The sides of this cell.
+        """
+        mask = 0
+        for side in sides:
+            if side.adjCells[0] is self:
+                mask |= 1 << side.adjCellDirs[0]
+            else:
+                mask |= 1 << side.adjCellDirs[1]
+        return mask
+
+    def getAllSidesExcept(self, *exclusions):
+        """Returns a list of all sides excluding a given list of sides.
 
         Args:
-            side (HexSide): The given side.
+            exclusionList ([HexSide]): A list containing the exceptions.
 
         Returns:
-            [HexSide]: A list of all sides of the cell which are connected to the given side.
+            [HexSide]: The list of all sides excluding the given list of sides.
         """
-        ret = []
-        validSides = set(side.connectedSides)
-        for candidateSide in self.sides:
-            if candidateSide in validSides:
-                ret.append(candidateSide)
-        return ret
+        return [side for side in self.sides if side not in exclusions]
 
     def getAllCellSidesConnectedToVertex(self, vertex):
         """Returns a tuple of the 2 sides of the cell which are connected to a given vertex.
@@ -267,27 +288,32 @@ class HexCell:
             direction (HexSideDir): The direction of the cap.
 
         Returns:
-            [HexSide]: The list containing three sides which compose the cap.
-            [HexSide]: The list containing the limbs attached to the cap.
+            (HexSide): The tuple containing three sides which compose the cap.
+            (HexSide): The tuple containing the limbs attached to the cap.
                        Some caps may have only one or no limbs at all (for cells at the edge).
         """
+        # The caps never change once the board is built, so each is only made once
+        if self._memoCaps[direction] is not None:
+            return self._memoCaps[direction]
+
         cap = []
         limbs = []
 
         targetSide = self.sides[direction]
         connSides = targetSide.connectedSides
         for side in connSides:
-            if side in self.sides:
+            if side.id in self.sideIds:
                 cap.append(side)
                 # The mid-link of the cap should be in the middle of the list
                 if len(cap) == 1:
                     cap.append(targetSide)
 
-        vtxDir1, vtxDir2 = direction.connectedVertexDirs()  # direction of the limbs
+        vtxDir1, vtxDir2 = SIDE_DIR_VERTEX_DIRS[direction]  # direction of the limbs
         limbs.append(self.limbs[vtxDir1])
         limbs.append(self.limbs[vtxDir2])
 
-        return cap, limbs
+        self._memoCaps[direction] = (tuple(cap), tuple(limbs))
+        return self._memoCaps[direction]
 
     def getUnsetSideLinks(self, simple=True):
         """
@@ -303,8 +329,9 @@ class HexCell:
 
         finishedSides = set()
         for side in self.sides:
-            if side not in finishedSides and side.isUnset():
-                sideLink = SideLink.fromSide(side, lambda side: side in self.sides, simple=simple)
+            if side.status == UNSET and side not in finishedSides:
+                sideLink = SideLink.fromSide(side, lambda side: side.id in self.sideIds,
+                                             simple=simple)
                 if sideLink is not None:
                     for memberSide in sideLink:
                         finishedSides.add(memberSide)
@@ -347,7 +374,7 @@ class HexCell:
             for vtxDir in dirs:
                 limb = self.limbs[vtxDir]
                 # If limb is active
-                if limb is not None and limb.isActive():
+                if limb is not None and limb.status == ACTIVE:
                     sidesAtVtx = sidesAtVertexDir[vtxDir]
                     # If both sides connected to the active limb are unset
                     if checkAllSidesAreUnset(sidesAtVtx):
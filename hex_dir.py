@@ -14,51 +14,16 @@ class HexSideDir(IntEnum):
 
     def isAdjacent(self, otherDir):
         """Returns true if the other direction is adjacent of this direction."""
-        if self == HexSideDir.UL:
-            return otherDir == HexSideDir.L or otherDir == HexSideDir.UR
-        if self == HexSideDir.UR:
-            return otherDir == HexSideDir.UL or otherDir == HexSideDir.R
-        if self == HexSideDir.R:
-            return otherDir == HexSideDir.UR or otherDir == HexSideDir.LR
-        if self == HexSideDir.LR:
-            return otherDir == HexSideDir.R or otherDir == HexSideDir.LL
-        if self == HexSideDir.LL:
-            return otherDir == HexSideDir.LR or otherDir == HexSideDir.L
-        if self == HexSideDir.L:
-            return otherDir == HexSideDir.LL or otherDir == HexSideDir.UL
-        raise AssertionError("Invalid Hex Side direction.")
+        return otherDir in SIDE_DIR_ADJACENT[self]
 
     def getAdjacentSides(self):
         """Returns a tuple of the two adjacent directions."""
-        if self == HexSideDir.UL:
-            return (HexSideDir.L, HexSideDir.UR)
-        if self == HexSideDir.UR:
-            return (HexSideDir.UL, HexSideDir.R)
-        if self == HexSideDir.R:
-            return (HexSideDir.UR, HexSideDir.LR)
-        if self == HexSideDir.LR:
-            return (HexSideDir.R, HexSideDir.LL)
-        if self == HexSideDir.LL:
-            return (HexSideDir.LR, HexSideDir.L)
-        if self == HexSideDir.L:
-            return (HexSideDir.LL, HexSideDir.UL)
-        raise AssertionError("Invalid Hex Side direction.")
+        dir1, dir2 = SIDE_DIR_ADJACENT[self]
+        return (HexSideDir(dir1), HexSideDir(dir2))
 
     def opposite(self):
         """Get the opposite direction of a give HexSideDir."""
-        if self == HexSideDir.UL:
-            return HexSideDir.LR
-        if self == HexSideDir.UR:
-            return HexSideDir.LL
-        if self == HexSideDir.R:
-            return HexSideDir.L
-        if self == HexSideDir.LR:
-            return HexSideDir.UL
-        if self == HexSideDir.LL:
-            return HexSideDir.UR
-        if self == HexSideDir.L:
-            return HexSideDir.R
-        raise AssertionError("Invalid Hex Side direction.")
+        return HexSideDir(SIDE_DIR_OPPOSITE[self])
 
     def connectedVertexDirs(self):
         """Get the vertices associated with this direction.
@@ -68,19 +33,7 @@ class HexSideDir(IntEnum):
                 The return will always be sorted according to this order: T, UR, LR, B, LL, UR
         """
 
-        if self == HexSideDir.UL:
-            return (HexVertexDir.T, HexVertexDir.UL)
-        if self == HexSideDir.UR:
-            return (HexVertexDir.T, HexVertexDir.UR)
-        if self == HexSideDir.R:
-            return (HexVertexDir.UR, HexVertexDir.LR)
-        if self == HexSideDir.LR:
-            return (HexVertexDir.LR, HexVertexDir.B)
-        if self == HexSideDir.LL:
-            return (HexVertexDir.LL, HexVertexDir.B)
-        if self == HexSideDir.L:
-            return (HexVertexDir.UL, HexVertexDir.LL)
-        raise AssertionError(f"Invalid side direction: {self}")
+        return SIDE_DIR_VERTEX_DIRS[self]
 
     def __str__(self):
         if self == HexSideDir.UL:
@@ -98,6 +51,19 @@ class HexSideDir(IntEnum):
         raise AssertionError("Invalid Hex Side direction")
 
 
+# The side directions, in order
+SIDE_DIRS = tuple(HexSideDir)
+
+# The opposite of each side direction as a plain int, indexed by the direction
+SIDE_DIR_OPPOSITE = tuple(int(sideDir) for sideDir in (HexSideDir.LR, HexSideDir.LL, HexSideDir.L,
+                                                       HexSideDir.UL, HexSideDir.UR, HexSideDir.R))
+
+# The two adjacent directions of each side direction as plain ints, indexed by the direction
+SIDE_DIR_ADJACENT = tuple((int(dir1), int(dir2)) for dir1, dir2 in (
+    (HexSideDir.L, HexSideDir.UR), (HexSideDir.UL, HexSideDir.R), (HexSideDir.UR, HexSideDir.LR),
+    (HexSideDir.R, HexSideDir.LL), (HexSideDir.LR, HexSideDir.L), (HexSideDir.LL, HexSideDir.UL)))
+
+
 class HexVertexDir(IntEnum):
     """The direction of a HexVertex."""
     T = 0
@@ -189,3 +155,9 @@ class HexVertexDir(IntEnum):
         if self == HexVertexDir.UL:
             return "UL"
         raise AssertionError("Invalid Hex Vertex direction")
+
+
+# The two vertex directions of each side direction, indexed by the side direction
+SIDE_DIR_VERTEX_DIRS = ((HexVertexDir.T, HexVertexDir.UL), (HexVertexDir.T, HexVertexDir.UR),
+                        (HexVertexDir.UR, HexVertexDir.LR), (HexVertexDir.LR, HexVertexDir.B),
+                        (HexVertexDir.LL, HexVertexDir.B), (HexVertexDir.UL, HexVertexDir.LL))
@@ -4,7 +4,7 @@
 from hex_side import HexSide
 from side_status import SideStatus
 from hex_game_move import HexGameMove, MovePriority
-from hex_dir import HexSideDir, HexVertexDir
+from hex_dir import HexSideDir, HexVertexDir, SIDE_DIR_OPPOSITE
 from hex_cell import HexCell
 from hex_vertex import HexVertex
 from point import Point
@@ -47,6 +47,9 @@ class HexGame:
         self.cells = []
         self.reqCells = []  # Cells that have a required number of sides
         self.sides = []
+        self.sideStatuses = bytearray()  # The status of each side, indexed by side id
+        self.changeCount = 0  # The number of side changes made through setSideStatus()
+        self.unsetSideIds = set()  # The ids of the sides set back to UNSET since popUnsetSides()
         self.vertices = []
 
         # For displaying the clicked cell coordinates
@@ -141,21 +144,25 @@ class HexGame:
                     vtx1 = cell.vertices[vtxDir1]
                     vtx2 = cell.vertices[vtxDir2]
 
-                    # Create the Side
-                    side = HexSide(len(self.sides), vtx1, vtx2, self.cellSideWidth)
+                    # Create the Side, along with its entry in the status column
+                    self.sideStatuses.append(SideStatus.UNSET)
+                    side = HexSide(len(self.sides), vtx1, vtx2, self.cellSideWidth,
+                                   self.sideStatuses)
                     # Register the Side to the Cell
                     cell.sides[sideDir] = side
-                    # Register the Cell as an adjacent cell of the Side
-                    side.adjCells[sideDir.opposite()] = cell
                     # Add this side to the list of all sides
                     self.sides.append(side)
 
                     # Look at the adjacent cell of this cell.
-                    # If it is not None, also register it to the Side.
+                    # If it is not None, also register the Side to it.
                     adjCell = cell.adjCells[sideDir]
                     if adjCell is not None:
-                        adjCell.sides[sideDir.opposite()] = side
-                        side.adjCells[sideDir] = adjCell
+                        adjCell.sides[SIDE_DIR_OPPOSITE[sideDir]] = side
+                        side.adjCells = (cell, adjCell)
+                        side.adjCellDirs = (int(sideDir), SIDE_DIR_OPPOSITE[sideDir])
+                    else:
+                        side.adjCells = (cell, None)
+                        side.adjCellDirs = (int(sideDir), None)
 
     def _registerLimbs(self):
         """Register the limbs of each cell. A limb is a `HexSide` which is not part
@@ -176,7 +183,9 @@ class HexGame:
                 limb = getLimb(cell, vtxDir)
                 cell.limbs[vtxDir] = limb
                 if limb is not None:
-                    limb.connCells[vtxDir] = cell
+                    # Register the cell at the limb's endpoint that it shares with the cell
+                    endpointIdx = limb.endpoints.index(cell.vertices[vtxDir])
+                    limb.connCells[endpointIdx] = cell
 
     def _initAll(self):
         for cell in self.cells:
@@ -259,6 +268,8 @@ class HexGame:
         if prevStatus != side.status:
             return
 
+        self.changeCount += 1
+
         # Append the move to the move history
         if appendToHistory:
             self.moveHistory.append(gameMove)
@@ -269,6 +280,7 @@ class HexGame:
             self._setSideBlank(side)
         elif newStatus == SideStatus.UNSET:
             side.setStatus(newStatus)
+            self.unsetSideIds.add(side.id)
         else:
             raise AssertionError(f"Invalid side status: {newStatus}")
 
@@ -362,6 +374,48 @@ class HexGame:
                     linkElem = self.sides[link1.pop()]
                     linkElem.setColorIdx(newColorIdx)
 
+    def popUnsetSides(self):
+        """Returns a list of the sides that were set back to `UNSET` since the last call,
+        and clears the set."""
+        ret = []
+        unsetSideIds = self.unsetSideIds
+        while unsetSideIds:
+            ret.append(self.sides[unsetSideIds.pop()])
+        return ret
+
+    def countSidesWithStatus(self, status):
+        """Returns the number of sides with the given status, counted over the status column.
+
+        Args:
+            status (SideStatus): The status to count.
+        """
+        return self.sideStatuses.count(status)
+
+    def getUnsetSides(self):
+        """Returns a list of all the `UNSET` sides, found by scanning the status column."""
+        ret = []
+        statuses = self.sideStatuses
+        sideId = statuses.find(SideStatus.UNSET)
+        while sideId != -1:
+            ret.append(self.sides[sideId])
+            sideId = statuses.find(SideStatus.UNSET, sideId + 1)
+        return ret
+
+    def getHangingSides(self):
+        """Returns a list of all the sides that are hanging (see `HexSide.isHanging`).
+
+        The sides are found in a single pass over the vertices: a vertex with
+        exactly one non-`BLANK` side leaves that side hanging.
+        """
+        ret = []
+        for vtx in self.vertices:
+            if vtx.nonBlankCount == 1:
+                for side in vtx.sides:
+                    if side.status != SideStatus.BLANK:
+                        ret.append(side)
+                        break
+        return ret
+
     def getCell(self, row, col):
         """Get the cell at the specified row and column of the board. Returns None if not found."""
         if row < 0 or row >= self.rows:
@@ -19,7 +19,8 @@ class HexGameMove:
             newStatus (SideStatus): The new status.
             prevStatus (SideStatus): The previous status. Optional.
                 Only set when Move has been applied to board.
-            msg (string): An explanation of the move. Optional.
+            msg (string): An explanation of the move. Optional. Can also be a tuple of a
+                format template and its arguments, which is only formatted when read.
             fromSolver (bool): True if the move was created by the solver.
         """
         assert(newStatus is not None), "The new status cannot be None"
@@ -29,13 +30,22 @@ class HexGameMove:
         self.newStatus = newStatus
         self.prevStatus = prevStatus
         self.priority = priority
-        self.msg = msg
+        self._msg = msg
         self.fromSolver = fromSolver
 
+    @property
+    def msg(self):
+        """The explanation of the move. Formatted on first access if it was given
+        as a template and its arguments."""
+        if isinstance(self._msg, tuple):
+            template, args = self._msg
+            self._msg = template.format(*(str(arg) for arg in args))
+        return self._msg
+
     def reverse(self):
         """Returns the reverse of this move."""
         return HexGameMove(self.sideId, self.prevStatus, self.newStatus, self.priority,
-                           self.msg, self.fromSolver)
+                           self._msg, self.fromSolver)
 
     def __eq__(self, other):
         return self.sideId == other.sideId and \
@@ -2,29 +2,55 @@
 
 from point import Point
 from hex_side_init import HexSideInitializer
+from hex_dir import HexSideDir
 from side_status import SideStatus
 
-# Define SideStatus members
-UNSET = SideStatus.UNSET
-ACTIVE = SideStatus.ACTIVE
-BLANK = SideStatus.BLANK
+# Define SideStatus members as plain ints, which is how the status is stored
+UNSET = int(SideStatus.UNSET)
+ACTIVE = int(SideStatus.ACTIVE)
+BLANK = int(SideStatus.BLANK)
+
+# The status each status toggles to, indexed by the current status
+_TOGGLE = (ACTIVE, BLANK, UNSET)
+
+# The shared result for getters that find nothing
+_EMPTY = ()
+
+# The label of each side direction, indexed by the direction
+_DIR_LABEL = tuple(str(sideDir) for sideDir in HexSideDir)
 
 
 class HexSide:
     """A side of a HexCell.
 
     Args:
+        idx (int): The id of the side. Also its index in the status column.
+        vertex1 (HexVertex): One endpoint of the side.
+        vertex2 (HexVertex): The other endpoint of the side.
+        length (int): The length of the side.
+        statusColumn (bytearray): The board-wide column of side statuses, indexed by side id.
+                                  The side writes its status through to this column.
         status (SideStatus): The status of the side.
     """
 
-    def __init__(self, idx, vertex1, vertex2, length, status=UNSET):
+    __slots__ = ("id", "colorIdx", "length", "status", "statusColumn", "adjCells", "adjCellDirs",
+                 "connCells", "endpoints", "connectedSides", "connectedSidesByVertex",
+                 "connectionVertex", "_memoLinkedTo", "_memoActiveConnSides", "_memoAdjCells",
+                 "_memoConnCells", "midX", "midY", "_midpoint")
+
+    def __init__(self, idx, vertex1, vertex2, length, statusColumn, status=UNSET):
         self.id = idx
-        self.isDirty = True
         self.colorIdx = idx
         self.length = length
-        self.status = status
-        self.adjCells = {}  # Can be listed by getAdjCells()
-        self.connCells = {}  # Can be listed by getConnectedCells()
+        self.status = int(status)
+        self.statusColumn = statusColumn
+        statusColumn[idx] = status
+        # The cell that owns this side, then the cell across it (None at the board edge)
+        self.adjCells = (None, None)  # Can be listed by getAdjCells()
+        # The direction of this side in each of the adjacent cells
+        self.adjCellDirs = (None, None)
+        # The cells this side is a limb of, one per endpoint (None if there is no such cell)
+        self.connCells = [None, None]  # Can be listed by getConnectedCells()
         self.endpoints = (vertex1, vertex2)
 
         ### Connectivity ###
@@ -41,14 +67,32 @@ class HexSide:
         # The memo dict of the other Sides commonly connected to this Side and another Side
         self._memoLinkedTo = None
 
+        # The adjacent cells and the cells this side is a limb of, without the empty slots
+        self._memoAdjCells = None
+        self._memoConnCells = None
+
+        # The memo of the connected ACTIVE sides. Cleared when a connected side
+        # becomes ACTIVE or stops being ACTIVE.
+        self._memoActiveConnSides = None
+
         # Calculate midpoint
-        midX = (vertex1.coords.x + vertex2.coords.x) / 2
-        midY = (vertex1.coords.y + vertex2.coords.y) / 2
-        self.midpoint = Point((midX, midY))
+        self.midX = (vertex1.coords.x + vertex2.coords.x) * 0.5
+        self.midY = (vertex1.coords.y + vertex2.coords.y) * 0.5
+        self._midpoint = None  # The midpoint as a Point, created on first access
 
         # Register yourself to the vertex
         vertex1.sides.append(self)
         vertex2.sides.append(self)
+        if status != BLANK:
+            vertex1.nonBlankCount += 1
+            vertex2.nonBlankCount += 1
+
+    @property
+    def midpoint(self):
+        """The midpoint of the side as a `Point`."""
+        if self._midpoint is None:
+            self._midpoint = Point((self.midX, self.midY))
+        return self._midpoint
 
     def initConnectivity(self):
         """Initialize the connected sides, vertices, and links."""
@@ -56,28 +100,52 @@ class HexSide:
         self.connectedSidesByVertex = HexSideInitializer.getConnectedSidesByVertex(self)
         self.connectionVertex = HexSideInitializer.getConnectionVertices(self)
         self._memoLinkedTo = HexSideInitializer.getOtherConnectedSidesMemo(self)
+        self._memoAdjCells = tuple(cell for cell in self.adjCells if cell is not None)
+        self._memoConnCells = tuple(cell for cell in self.connCells if cell is not None)
 
     def setStatus(self, newStatus):
         """Sets the status. Does nothing if the new status is equal
-        to current status. Sets `isDirty` to true if status was changed.
+        to current status.
 
         Args:
             newStatus (SideStatus): The new status.
         """
         if self.status != newStatus:
-            self.status = newStatus
-            self.isDirty = True
+            # The connected sides' active memos are stale if this side enters or leaves ACTIVE
+            if self.status == ACTIVE or newStatus == ACTIVE:
+                for connSide in self.connectedSides:
+                    connSide.invalidateActiveConnSides()
+            # Keep the adjacent cells' status masks up to date
+            for cell, sideDir in zip(self.adjCells, self.adjCellDirs):
+                if cell is not None:
+                    bit = 1 << sideDir
+                    if self.status == ACTIVE:
+                        cell.activeMask &= ~bit
+                    elif self.status == BLANK:
+                        cell.blankMask &= ~bit
+                    if newStatus == ACTIVE:
+                        cell.activeMask |= bit
+                    elif newStatus == BLANK:
+                        cell.blankMask |= bit
+            # Keep the endpoints' non-BLANK counts up to date
+            if self.status == BLANK:
+                self.endpoints[0].nonBlankCount += 1
+                self.endpoints[1].nonBlankCount += 1
+            elif newStatus == BLANK:
+                self.endpoints[0].nonBlankCount -= 1
+                self.endpoints[1].nonBlankCount -= 1
+            self.status = int(newStatus)
+            self.statusColumn[self.id] = newStatus
 
     def setColorIdx(self, newColorIdx):
         """Sets the color index. Does nothing if the new color index is equal
-        to current color index. Sets `isDirty` to true if it was changed.
+        to current color index.
 
         Args:
             newColorIdx (SideStatus): The new color index.
         """
         if self.colorIdx != newColorIdx:
             self.colorIdx = newColorIdx
-            self.isDirty = True
 
     def isActive(self):
         """Returns true if the side is active. False otherwise."""
@@ -94,7 +162,7 @@ class HexSide:
     def isConnectedTo(self, otherSide):
         """Returns true if this `Side` shares a common vertex with a given `Side`.
         Returns false otherwise."""
-        return otherSide in self.connectedSides
+        return otherSide.id in self.connectionVertex
 
     def isLinkedTo(self, otherSide, ignoreStatus=False):
         """
@@ -118,12 +186,11 @@ class HexSide:
         if ignoreStatus or self.status == otherSide.status:
             # If the other commonly connected Sides are BLANK, return True.
             # Otherwise, return False.
-            ret = True
+            blank = BLANK
             for connSide in self._memoLinkedTo[otherSide.id]:
-                if not connSide.isBlank():
-                    ret = False
-                    break
-            return ret
+                if connSide.status != blank:
+                    return False
+            return True
 
         return False
 
@@ -149,15 +216,9 @@ class HexSide:
         if this side's own status is `BLANK`.
         """
 
-        if self.status == UNSET or self.status == ACTIVE:
-            for connectedSides in self.connectedSidesByVertex:
-                allBlank = True
-                for side in connectedSides:
-                    if not side.isBlank():
-                        allBlank = False
-                        break
-                if allBlank:
-                    return True
+        # This side is the only non-BLANK side at a hanging endpoint
+        if self.status != BLANK:
+            return self.endpoints[0].nonBlankCount == 1 or self.endpoints[1].nonBlankCount == 1
         return False
 
     def getAllLinkedSides(self, ignoreStatus=False):
@@ -170,27 +231,37 @@ class HexSide:
                                  Optional. Defaults to False.
         """
         ret = []
+        # A BLANK side is never linked
+        if self.status == BLANK:
+            return ret
         for connSide in self.connectedSides:
             if self.isLinkedTo(connSide, ignoreStatus):
                 ret.append(connSide)
         return ret
 
     def getAllActiveConnectedSides(self):
-        """Returns a list of all the connected sides whose status is `ACTIVE`."""
-        ret = []
-        for connSide in self.endpoints[0].getActiveSidesExcept(self.id):
-            ret.append(connSide)
-        for connSide in self.endpoints[1].getActiveSidesExcept(self.id):
-            ret.append(connSide)
-        return ret
+        """Returns a tuple of all the connected sides whose status is `ACTIVE`."""
+        if self._memoActiveConnSides is None:
+            activeSides1 = self.endpoints[0].getActiveSidesExcept(self.id)
+            activeSides2 = self.endpoints[1].getActiveSidesExcept(self.id)
+            if activeSides1 or activeSides2:
+                self._memoActiveConnSides = (*activeSides1, *activeSides2)
+            else:
+                self._memoActiveConnSides = _EMPTY
+        return self._memoActiveConnSides
+
+    def invalidateActiveConnSides(self):
+        """Drops the memo of the connected `ACTIVE` sides. Called when a connected side
+        becomes `ACTIVE` or stops being `ACTIVE`."""
+        self._memoActiveConnSides = None
 
     def getAdjCells(self):
-        """Returns a list containing the adjacent cells."""
-        return self.adjCells.values()
+        """Returns a tuple containing the adjacent cells."""
+        return self._memoAdjCells
 
     def getConnectedCells(self):
-        """Returns a list of cells of which this side is a limb of."""
-        return self.connCells.values()
+        """Returns a tuple of cells of which this side is a limb of."""
+        return self._memoConnCells
 
     def toggleStatus(self):
         """Toggles the status from `UNSET` to `ACTIVE` to `BLANK`.
@@ -198,25 +269,18 @@ class HexSide:
         Returns:
             SideStatus: The status of the side after toggling.
         """
-        if self.status == UNSET:
-            self.setStatus(ACTIVE)
-        elif self.status == ACTIVE:
-            self.setStatus(BLANK)
-        elif self.status == BLANK:
-            self.setStatus(UNSET)
-        else:
-            raise AssertionError(f"Invalid status: {self.status}")
-
-        return self.status
-
-    def __eq__(self, other):
-        return other.id == self.id
+        newStatus = _TOGGLE[self.status]
+        self.setStatus(newStatus)
+        return newStatus
 
     def __hash__(self):
-        return hash(self.id)
+        # Sides are unique per id, so equality is left as identity. The id-based hash
+        # keeps the iteration order of side sets (and thus the solver's moves) reproducible.
+        return self.id
 
     def __str__(self):
         """Returns a string describing the Side."""
-        for sideDir in self.adjCells:
-            return f"{str(sideDir.opposite())} of {self.adjCells[sideDir]}"
-        raise AssertionError("Did not find a valid adjacent cell.")
+        cell = self.adjCells[0]
+        if cell is None:
+            raise AssertionError("Did not find a valid adjacent cell.")
+        return f"{_DIR_LABEL[self.adjCellDirs[0]]} of {cell}"
@@ -6,45 +6,36 @@ class HexSideInitializer:
 
     @staticmethod
     def getAllConnectedSides(side):
-        """Returns all the connected sides of a given HexSide."""
-        ret = []
-        for connSide in side.endpoints[0].getAllSidesExcept(side.id):
-            ret.append(connSide)
-        for connSide in side.endpoints[1].getAllSidesExcept(side.id):
-            ret.append(connSide)
-        return ret
+        """Returns a tuple of all the connected sides of a given HexSide."""
+        return (*side.endpoints[0].getAllSidesExcept(side.id),
+                *side.endpoints[1].getAllSidesExcept(side.id))
 
     @staticmethod
     def getConnectedSidesByVertex(side):
-        """Returns the connected sides sorted by vertex."""
-        connSidesAtVtx1 = side.endpoints[0].getAllSidesExcept(side.id)
-        connSidesAtVtx2 = side.endpoints[1].getAllSidesExcept(side.id)
+        """Returns the connected sides sorted by vertex, as a tuple of two tuples."""
+        connSidesAtVtx1 = tuple(side.endpoints[0].getAllSidesExcept(side.id))
+        connSidesAtVtx2 = tuple(side.endpoints[1].getAllSidesExcept(side.id))
         return (connSidesAtVtx1, connSidesAtVtx2)
 
     @staticmethod
     def getConnectionVertices(side):
         """Returns a dictionary containing the common vertex between
         the given side and its connected sides."""
-        connVertexDict = {}
-        for connSide in HexSideInitializer.getAllConnectedSides(side):
-            if side.endpoints[0] in connSide.endpoints:
-                connVertexDict[connSide.id] = side.endpoints[0]
-            elif side.endpoints[1] in connSide.endpoints:
-                connVertexDict[connSide.id] = side.endpoints[1]
-        return connVertexDict
+        # The connected sides are already partitioned by the vertex they share with this side
+        vtx1, vtx2 = side.endpoints
+        connSidesAtVtx1, connSidesAtVtx2 = side.connectedSidesByVertex
+        return {connSide.id: vtx1 for connSide in connSidesAtVtx1} | \
+            {connSide.id: vtx2 for connSide in connSidesAtVtx2}
 
     @staticmethod
     def getOtherConnectedSidesMemo(side):
         """Returns a dictionary containing the other Sides commonly connected to
         both the given side and another Side."""
         ret = {}
-        for connSide in HexSideInitializer.getAllConnectedSides(side):
-            tmp = []
-            # Get common vertex
-            commonVertex = side.getConnectionVertex(connSide)
-            # Get all other sides which share the common vertex
-            for commonSide in commonVertex.sides:
-                if commonSide != side and commonSide != connSide:
-                    tmp.append(commonSide)
-            ret[connSide.id] = tmp
+        # The sides sharing a vertex with this side are the other sides commonly
+        # connected to each of them, so one pass per vertex partition is enough
+        for connSidesAtVtx in side.connectedSidesByVertex:
+            for connSide in connSidesAtVtx:
+                ret[connSide.id] = tuple(commonSide for commonSide in connSidesAtVtx
+                                         if commonSide is not connSide)
         return ret
@@ -2,12 +2,17 @@
 
 # pylint: disable=too-many-lines
 
+from heapq import heappush, heappop, heapify
+from itertools import chain
+from math import hypot
 from profilehooks import profile
 from side_status import SideStatus
 from hex_game_move import HexGameMove, MovePriority
 from cell_faction import CellFaction
-from hex_dir import HexSideDir
+from hex_dir import HexSideDir, SIDE_DIRS, SIDE_DIR_OPPOSITE, SIDE_DIR_ADJACENT, \
+    SIDE_DIR_VERTEX_DIRS
 from side_link import SideLink
+from hex_cell import MASK_COUNT
 from helpers import measureStart, measureEnd
 
 # Define SideStatus members
@@ -22,13 +27,52 @@ NORMAL = MovePriority.NORMAL
 LOW = MovePriority.LOW
 LOWEST = MovePriority.LOWEST
 
-# Define SideDir members
-S_UL = HexSideDir.UL
-S_UR = HexSideDir.UR
-S_R = HexSideDir.R
-S_LR = HexSideDir.LR
-S_LL = HexSideDir.LL
-S_L = HexSideDir.L
+# Define SideDir members as plain ints, which index the cells' side tuples directly
+S_UL = int(HexSideDir.UL)
+S_UR = int(HexSideDir.UR)
+S_R = int(HexSideDir.R)
+S_LR = int(HexSideDir.LR)
+S_LL = int(HexSideDir.LL)
+S_L = int(HexSideDir.L)
+
+# The face-to-face loop cases checked by `inspectFaceToFaceLoops`. Each case is a tuple of:
+#   - The direction of the two active sides that are part of the same loop
+#   - The direction of the adjacent cell
+#   - The direction of the unset sides. First two values are for the cell,
+#     next two values are for the adjacent cell.
+#   - The side of the cell to activate if we have a face to face loop
+FACE_TO_FACE_CASES = (
+    ((S_L, S_R), S_UL, (S_UL, S_UR, S_LL, S_LR), S_UL),
+    ((S_L, S_R), S_UR, (S_UL, S_UR, S_LL, S_LR), S_UR),
+    ((S_L, S_R), S_LL, (S_LL, S_LR, S_UL, S_UR), S_LL),
+    ((S_L, S_R), S_LR, (S_LL, S_LR, S_UL, S_UR), S_LR),
+
+    ((S_UL, S_LR), S_UR, (S_UR, S_R, S_L, S_LL), S_UR),
+    ((S_UL, S_LR), S_R, (S_UR, S_R, S_L, S_LL), S_R),
+    ((S_UL, S_LR), S_LL, (S_L, S_LL, S_R, S_UR), S_LL),
+    ((S_UL, S_LR), S_L, (S_L, S_LL, S_R, S_UR), S_L),
+
+    ((S_UR, S_LL), S_UL, (S_UL, S_L, S_R, S_LR), S_UL),
+    ((S_UR, S_LL), S_L, (S_UL, S_L, S_R, S_LR), S_L),
+    ((S_UR, S_LL), S_R, (S_R, S_LR, S_UL, S_L), S_R),
+    ((S_UR, S_LL), S_LR, (S_R, S_LR, S_UL, S_L), S_LR),
+)
+
+# The move messages that depend on a side direction, indexed by the direction
+_MSG_CLOSE_OFF_5 = tuple(f"The 5-Cell cannot close off the {sideDir} direction."
+                         for sideDir in SIDE_DIRS)
+_MSG_OPEN_5 = tuple(f"The 5-Cell cannot be open in the {sideDir} direction."
+                    for sideDir in SIDE_DIRS)
+
+# The move messages that depend on a cell's required sides, indexed by the required sides
+_MSG_GROUP_ACTIVE = tuple(f"Side group of {reqSides}-Cell should be active "
+                          "(using theoretical clues)." for reqSides in range(7))
+_MSG_GROUP_BLANK = tuple(f"Side group of {reqSides}-Cell should be blank "
+                         "(using theoretical clues)." for reqSides in range(7))
+_MSG_FUSE = tuple(f"Remaining required sides of {reqSides}-Cell is 2, so fuse the two together."
+                  for reqSides in range(7))
+_MSG_BISECT = tuple(f"Remaining required sides of {reqSides}-Cell is 2, so bisect the two links."
+                    for reqSides in range(7))
 
 
 class HexSolver:
@@ -36,20 +80,49 @@ class HexSolver:
 
     def __init__(self, game):
         self.game = game
-        self.nextMoveList = []
-        self.processedSideIds = set()
+        self._resetState()
         self.resetFactions()
 
+        # The less obvious cell inspections, in the order they are tried, keyed by the
+        # required sides of the cell. Each tuple only has the inspections that apply to it.
+        self._lessObviousInspections = {None: ()}
+        for reqSides in range(len(HexSideDir) + 1):
+            inspections = []
+            if reqSides == 3:
+                inspections.append(self.inspectSymmetrical3Cell)
+            inspections += [self.inspectUnsetSideLinks, self.inspectTheoreticals]
+            if reqSides == 5:
+                inspections.append(self.inspect5CellNeighbors)
+            inspections.append(self.inspectRemaining2Group)
+            self._lessObviousInspections[reqSides] = tuple(inspections)
+
         self.initialBoardInspection()
         self.solveAll()
 
     def reset(self):
         """Reset the solver"""
-        self.nextMoveList = []
-        self.processedSideIds = set()
+        self._resetState()
         self.initialBoardInspection()
         self.resetFactions()
 
+    def _resetState(self):
+        """Set the move queue, the memos and the board epoch to their initial state."""
+        self.nextMoveList = []  # A heap of (priority, order, move) entries
+        self.moveCounter = 0  # The order of the next added move
+        self.requeueCounter = 0  # The order of the next requeued move, counting down
+        # Whether each side has already been queued once, indexed by side id
+        self.processedSides = bytearray(len(self.game.sides))
+        self._memoFaceToFaceCases = {}
+        self._memoLinks = {}
+        self._memoFullLinks = {}
+        self._memoUnsetSideLinks = {}
+        self._memoTheoreticalBlanks = {}
+        self.boardEpoch = 0
+        self._syncedChangeCount = self.game.changeCount  # The game changes seen by the epoch
+        self._sideInspectedEpoch = {}
+        self._cellInspectedEpoch = {}
+        self.dirtyFactionCells = {}  # The cells whose faction became known, keyed by id
+
     # @profile(immediate=True)
     def solveAll(self):
         """Solve the whole board."""
@@ -58,14 +131,20 @@ class HexSolver:
         measureStart("SolveAll")
         countSidesSet = 0
 
+        # Bind the lookups used on every move once, outside the loop
+        sides = self.game.sides
+        getNextMove = self.getNextMove
+        setSideStatus = self.game.setSideStatus
+        inspectObviousVicinity = self.inspectObviousVicinity
+
         while True:
-            nextMove = self.getNextMove(doSort=False)
+            nextMove = getNextMove(doSort=False)
             if nextMove is None:
                 break
             countSidesSet += 1
-            side = self.game.sides[nextMove.sideId]
-            self.game.setSideStatus(nextMove)
-            self.inspectObviousVicinity(side)
+            side = sides[nextMove.sideId]
+            setSideStatus(nextMove)
+            inspectObviousVicinity(side)
 
         perfTime = measureEnd("SolveAll")
         print("Number of sides set:", countSidesSet)
@@ -77,6 +156,59 @@ class HexSolver:
         One-time obvious moves are those that need to be checked only once,
         like the 5-and-5 adjacent cells, or the 1-and-5 adjacent cells, or zero-cells.
         """
+        # pylint: disable=unused-argument
+
+        ###  1-AND-5  ###
+        def inspect1And5(cell, adjCell, sideDir):
+            # Set boundary to ACTIVE
+            boundary = cell.sides[sideDir]
+            msg = "Set boundary of 1-and-5 to active."
+            self.addNextMove(boundary, ACTIVE, HIGH, msg)
+            # Which means that the 1-Cell is solved, but it will be handled later
+
+        ###  1-AND-4  ###
+        def inspect1And4(cell, adjCell, sideDir):
+            # Remove the cap of 1
+            cap, limbs = cell.getCap(SIDE_DIR_OPPOSITE[sideDir])
+            msg = "Remove cap of 1-Cell at direction opposite the adjacent 4-Cell."
+            self.addNextMoves(cap, BLANK, HIGH, msg)
+            self.addNextMoves(limbs, BLANK, HIGH, msg)
+
+        ###  1-AND-2  ###
+        def inspect1And2(cell, adjCell, sideDir):
+            # Set boundary to BLANK
+            msg = "Set the boundary of 1-and-2 to blank."
+            self.addNextMove(cell.sides[sideDir], BLANK, HIGH, msg)
+
+        ###  1-AND-1  ###
+        def inspect1And1(cell, adjCell, sideDir):
+            # Set boundary to BLANK
+            msg = "Set the boundary of 1-and-1 to blank."
+            self.addNextMove(cell.sides[sideDir], BLANK, HIGH, msg)
+
+        ###  5-AND-5  ###
+        def inspect5And5(cell, adjCell, sideDir):
+            # Set boundary to ACTIVE, then cap the opposite ends,
+            # the remove the limbs of the cap
+            msg = "Set boundary of 5-and-5 to active."
+            self.addNextMove(cell.sides[sideDir], ACTIVE, HIGH, msg)
+            cap1, limbs1 = cell.getCap(SIDE_DIR_OPPOSITE[sideDir])
+            cap2, limbs2 = adjCell.getCap(sideDir)
+            msg = "Activate the cap of both 5-and-5 cells."
+            self.addNextMoves(chain(cap1, cap2), ACTIVE, HIGH, msg)
+            msg = "Remove dead limbs of both 5-and-5 cells."
+            self.addNextMoves(chain(limbs1, limbs2), BLANK, HIGH, msg)
+
+        # The rules for a pair of adjacent cells, keyed by their required sides
+        adjCellRules = {
+            (1, 5): inspect1And5,
+            (1, 4): inspect1And4,
+            (1, 2): inspect1And2,
+            (1, 1): inspect1And1,
+            (5, 5): inspect5And5,
+        }
+
+        pairedCellIds = set()  # The 1-Cells and 5-Cells whose pairs have been handled
         for cell in self.game.reqCells:
             if cell.reqSides == 0:
                 # Remove all sides and limbs of zero-cells
@@ -85,89 +217,65 @@ class HexSolver:
                 for limb in cell.limbs:
                     self.addNextMove(limb, BLANK, HIGH, "Remove limbs of zero-cell.")
 
-            elif cell.reqSides == 1:
-                for sideDir in HexSideDir:
-                    adjCell = cell.adjCells[sideDir]
-                    if adjCell is not None:
-                        ###  1-AND-5  ###
-                        if adjCell.reqSides == 5:
-                            # Set boundary to ACTIVE
-                            boundary = cell.sides[sideDir]
-                            msg = "Set boundary of 1-and-5 to active."
-                            self.addNextMove(boundary, ACTIVE, HIGH, msg)
-                            # Which means that the 1-Cell is solved, but it will be handled later
-
-                        ###  1-AND-4  ###
-                        elif adjCell.reqSides == 4:
-                            # Remove the cap of 1
-                            cap, limbs = cell.getCap(sideDir.opposite())
-                            msg = "Remove cap of 1-Cell at direction opposite the adjacent 4-Cell."
-                            self.addNextMoves(cap, BLANK, HIGH, msg)
-                            self.addNextMoves(limbs, BLANK, HIGH, msg)
-
-                        ###  1-AND-2  ###
-                        elif adjCell.reqSides == 2:
-                            # Set boundary to BLANK
-                            msg = "Set the boundary of 1-and-2 to blank."
-                            self.addNextMove(cell.sides[sideDir], BLANK, HIGH, msg)
-
-                        ###  1-AND-1  ###
-                        elif adjCell.reqSides == 1:
-                            # Set boundary to BLANK
-                            msg = "Set the boundary of 1-and-1 to blank."
-                            self.addNextMove(cell.sides[sideDir], BLANK, HIGH, msg)
-
             elif cell.reqSides == 2:
                 ###  5-AND-2-AND-5  ###
                 adj5CellDirs = []
-                for sideDir in HexSideDir:
-                    adjCell = cell.adjCells[sideDir]
+                for sideDir, adjCell in enumerate(cell.adjCells):
                     if adjCell is not None and adjCell.reqSides == 5:
                         adj5CellDirs.append(sideDir)
 
                 # If the 2-Cell has two adjacent 5-Cells
                 if len(adj5CellDirs) == 2:
                     # And if the two 5-Cells are not adjacent themselves
-                    if not adj5CellDirs[0].isAdjacent(adj5CellDirs[1]):
+                    if adj5CellDirs[1] not in SIDE_DIR_ADJACENT[adj5CellDirs[0]]:
                         # Then those two dirs should be ACTIVE
                         msg = "The two sides of the 2-Cell adjacent 5-Cells should be active."
                         self.addNextMove(cell.sides[adj5CellDirs[0]], ACTIVE, HIGH, msg)
                         self.addNextMove(cell.sides[adj5CellDirs[1]], ACTIVE, HIGH, msg)
 
-            elif cell.reqSides == 5:
-                for sideDir in HexSideDir:
-                    adjCell = cell.adjCells[sideDir]
+            elif cell.reqSides == 1 or cell.reqSides == 5:
+                for sideDir, adjCell in enumerate(cell.adjCells):
                     if adjCell is not None:
-                        ###  5-AND-5  ###
-                        if adjCell.reqSides == 5:
-                            # Set boundary to ACTIVE, then cap the opposite ends,
-                            # the remove the limbs of the cap
-                            msg = "Set boundary of 5-and-5 to active."
-                            self.addNextMove(cell.sides[sideDir], ACTIVE, HIGH, msg)
-                            cap1, limbs1 = cell.getCap(sideDir.opposite())
-                            cap2, limbs2 = adjCell.getCap(sideDir)
-                            msg = "Activate the cap of both 5-and-5 cells."
-                            self.addNextMoves(cap1 + cap2, ACTIVE, HIGH, msg)
-                            msg = "Remove dead limbs of both 5-and-5 cells."
-                            self.addNextMoves(limbs1 + limbs2, BLANK, HIGH, msg)
+                        # The rules for a pair of same cells are symmetric,
+                        # so each such pair is handled once, from the first cell
+                        if adjCell.reqSides == cell.reqSides and adjCell.id in pairedCellIds:
+                            continue
+                        rule = adjCellRules.get((cell.reqSides, adjCell.reqSides))
+                        if rule is not None:
+                            rule(cell, adjCell, sideDir)
+                pairedCellIds.add(cell.id)
 
     def inspectEverything(self):
         """Inspect all cells and all sides."""
+        # Bind the methods called for every cell and side once, outside the loops
+        inspectObviousCellClues = self.inspectObviousCellClues
+        inspectLessObviousCellClues = self.inspectLessObviousCellClues
+        inspectObviousSideClues = self.inspectObviousSideClues
+        inspectLoopMaker = self.inspectLoopMaker
+        inspectFaceToFaceLoops = self.inspectFaceToFaceLoops
+        nextMoveList = self.nextMoveList
+
         for cell in self.game.reqCells:
-            self.inspectObviousCellClues(cell)
-            self.inspectLessObviousCellClues(cell)
+            inspectObviousCellClues(cell)
+            inspectLessObviousCellClues(cell)
+
+        # Hanging sides are collected for the whole board at once
+        for side in self.game.getHangingSides():
+            if side.status == UNSET:
+                self.removeHangingSide(side)
 
-        for side in self.game.sides:
-            self.inspectObviousSideClues(side)
-            self.inspectLoopMaker(side)
+        # Only the UNSET sides can yield a move
+        for side in self.game.getUnsetSides():
+            inspectObviousSideClues(side, checkHanging=False)
+            inspectLoopMaker(side)
 
         for cell in self.game.cells:
-            if len(self.nextMoveList) > 0:
+            if nextMoveList:
                 break
-            self.inspectFaceToFaceLoops(cell)
+            inspectFaceToFaceLoops(cell)
 
         # If there are still no moves
-        if len(self.nextMoveList) == 0:
+        if not self.nextMoveList:
             self.inspectFactions()
 
     def inspectObviousVicinity(self, side):
@@ -175,7 +283,8 @@ class HexSolver:
         for obvious clues. Adds the obvious moves to the `nextMoveList`."""
         # Inspect the sides that are connected to this side
         for connSide in side.connectedSides:
-            self.inspectObviousSideClues(connSide)
+            if connSide.status == UNSET:
+                self.inspectObviousSideClues(connSide)
         # Inspect the cells this side is connected to
         for adjCell in side.getAdjCells():
             self.inspectObviousCellClues(adjCell)
@@ -187,31 +296,50 @@ class HexSolver:
     # INSPECT SIDE
     ###########################################################################
 
-    def inspectObviousSideClues(self, side):
-        """Inspect a given `HexSide` for obvious clues. Does not process non-`UNSET` sides."""
+    def inspectObviousSideClues(self, side, checkHanging=True):
+        """Inspect a given `HexSide` for obvious clues.
+        The callers only pass `UNSET` sides, since other sides cannot yield a move.
 
-        # Do not process non-`UNSET` sides.
-        if not side.isUnset():
+        Args:
+            side (HexSide): The `UNSET` side to inspect.
+            checkHanging (bool): If false, the hanging check is skipped because the caller
+                                 has already handled the hanging sides. Optional.
+        """
+
+        # A side whose move is already queued is decided, and will be looked at again
+        # through its vicinity once the move is applied
+        if self.processedSides[side.id]:
             return
 
-        self.inspectHangingSide(side)
+        # Nothing new can be found if the side was fully inspected and the board hasn't changed
+        self.syncBoardEpoch()
+        if self._sideInspectedEpoch.get(side.id) == self.boardEpoch:
+            return
+
+        if checkHanging:
+            self._sideInspectedEpoch[side.id] = self.boardEpoch
+            self.inspectHangingSide(side)
         self.inspectConnectingToIntersection(side)
         self.inspectContinueActiveLink(side)
 
     def inspectHangingSide(self, side):
         """Set side to BLANK if it is hanging."""
         if side.isHanging():
-            # Also include the continuation of its link, if any
-            hangingLink = SideLink.fromSide(side)
-            msg = "Remove hanging side."
-            self.addNextMoves(hangingLink, BLANK, HIGHEST, msg=msg)
+            self.removeHangingSide(side)
+
+    def removeHangingSide(self, side):
+        """Set a hanging side to BLANK, along with the continuation of its link, if any."""
+        hangingLink = self.getLink(side)
+        msg = "Remove hanging side."
+        self.addNextMoves(hangingLink, BLANK, HIGHEST, msg=msg)
 
     def inspectConnectingToIntersection(self, side):
-        """Set an UNSET side to BLANK if it is connecting to an intersection."""
+        """Set an UNSET side to BLANK if it is connecting to an intersection.
+        The caller makes sure the side is `UNSET`."""
         vtx1, vtx2 = side.endpoints
-        if side.isUnset() and (vtx1.isIntersection() or vtx2.isIntersection()):
+        if vtx1.isIntersection() or vtx2.isIntersection():
             # Also include the continuation of its link, if any
-            hangingLink = SideLink.fromSide(side)
+            hangingLink = self.getLink(side)
             msg = "Remove side connecting to intersection."
             self.addNextMoves(hangingLink, BLANK, HIGHEST, msg=msg)
 
@@ -219,18 +347,19 @@ class HexSolver:
         """Set an UNSET side to ACTIVE if it is a continuation of an active link."""
         for connSide in side.getAllActiveConnectedSides():
             if side.isLinkedTo(connSide, ignoreStatus=True):
-                fullLink = SideLink.fromSide(side)
+                fullLink = self.getLink(side)
                 msg = "Activate the link continuation."
                 self.addNextMoves(fullLink, ACTIVE, HIGHEST, msg=msg)
 
     def inspectLoopMaker(self, side):
-        """Inspect a side if setting it to ACTIVE will create a loop. If so, set it to BLANK."""
+        """Inspect a side if setting it to ACTIVE will create a loop. If so, set it to BLANK.
+        The caller makes sure the side is `UNSET`."""
 
-        # Only process UNSET sides
-        if side.isUnset():
+        # Only process sides which are not queued yet, since only the side itself is queued
+        if not self.processedSides[side.id]:
 
             # Get the whole link
-            link = SideLink.fromSide(side, simple=False)
+            link = self.getLink(side, simple=False)
 
             # Get the connected sides on each endpoint
             connActiveSides1 = link.endpoints[0].getActiveSidesExcept(link.endLink[0].id)
@@ -242,56 +371,141 @@ class HexSolver:
                 activeSide2 = connActiveSides2[0]
 
                 if activeSide1.colorIdx == activeSide2.colorIdx:
-                    if SideLink.isSameLink(activeSide1, activeSide2):
+                    # A memoized link is shared by all of its sides, so the two active sides
+                    # are in the same link if they get the same link object
+                    if self.getLink(activeSide1) is self.getLink(activeSide2):
                         self.addNextMove(side, BLANK, LOW, "Remove link which creates a loop.")
 
+    def syncBoardEpoch(self):
+        """Start a new board epoch if the game has changed since the last call.
+
+        The board does not change within an epoch, so the results memoized
+        for the previous epoch are dropped.
+        """
+        if self.game.changeCount != self._syncedChangeCount:
+            self._syncedChangeCount = self.game.changeCount
+            self.boardEpoch += 1
+            self._memoLinks = {}
+            self._memoFullLinks = {}
+            self._memoUnsetSideLinks = {}
+            self._memoTheoreticalBlanks = {}
+
+    def getLink(self, side, simple=True):
+        """Returns the link of a given side, as created by `SideLink.fromSide`.
+
+        The links are memoized until any side changes. Since every side of a link
+        has the same link, a created link is memoized for all of its sides.
+
+        Args:
+            side (HexSide): The given side.
+            simple (bool): If false, the endpoints of the link are also calculated.
+        """
+        self.syncBoardEpoch()
+        memo = self._memoLinks if simple else self._memoFullLinks
+        if side.id in memo:
+            return memo[side.id]
+
+        link = SideLink.fromSide(side, simple=simple)
+        if link is None:
+            memo[side.id] = None
+        else:
+            for linkSide in link.sides:
+                memo[linkSide.id] = link
+        return link
+
+    def getUnsetSideLinks(self, cell, simple=True):
+        """Returns the `UNSET` links of a given cell, as created by `cell.getUnsetSideLinks`.
+
+        The links are memoized until any side changes, since several cell inspections
+        look at the same links of a cell.
+
+        Args:
+            cell (HexCell): The given cell.
+            simple (bool): If false, the endpoints of the links are also calculated.
+        """
+        self.syncBoardEpoch()
+        key = (cell.id, simple)
+        links = self._memoUnsetSideLinks.get(key)
+        if links is None:
+            links = cell.getUnsetSideLinks(simple=simple)
+            self._memoUnsetSideLinks[key] = links
+        return links
+
+    def getTheoreticalBlanks(self, cell):
+        """Returns the theoretical blanks of a given cell, as calculated by
+        `cell.getTheoreticalBlanks`, along with the side mask of each list of sides.
+
+        The result is memoized until any side changes.
+
+        Args:
+            cell (HexCell): The given cell.
+
+        Returns:
+            (int, [[HexSide]], [int]): The number of theoretical blanks, the sides that are
+                part of the subset for each dir combination, and the side mask of each subset.
+        """
+        self.syncBoardEpoch()
+        ret = self._memoTheoreticalBlanks.get(cell.id)
+        if ret is None:
+            count, theoreticalSidesList = cell.getTheoreticalBlanks()
+            masks = [cell.getSideMask(theoreticalSides)
+                     for theoreticalSides in theoreticalSidesList]
+            ret = (count, theoreticalSidesList, masks)
+            self._memoTheoreticalBlanks[cell.id] = ret
+        return ret
+
     ###########################################################################
     # INSPECT CELL
     ###########################################################################
 
     def inspectObviousCellClues(self, cell):
         """Inspect a given cell for obvious clues."""
+        # Nothing new can be found if the cell was inspected and the board hasn't changed
+        self.syncBoardEpoch()
+        if self._cellInspectedEpoch.get(cell.id) == self.boardEpoch:
+            return
+        self._cellInspectedEpoch[cell.id] = self.boardEpoch
+
         if not cell.isFullySet(memoize=True):
             if cell.reqSides is not None:
                 # If already has correct number of ACTIVE sides, set others to BLANK
                 if cell.countActiveSides() == cell.reqSides:
-                    msg = "Cell already has correct number of active sides, " + \
+                    msg = "Cell already has correct number of active sides, " \
                         "so remove the other unset sides."
                     self.addNextMoves(cell.getUnsetSides(), BLANK, HIGHEST, msg)
 
                 # If already has correct number of BLANK sides, set others to ACTIVE
-                elif cell.countBlankSides() == cell.requiredBlanks():
+                elif cell.countBlankSides() == cell.reqBlanks:
                     msg = "Cell already has enough blank sides, so activate the other unset sides."
                     self.addNextMoves(cell.getUnsetSides(), ACTIVE, HIGHEST, msg)
 
-                else:
+                elif cell.reqSides == 4:
                     self.inspect4CellGroupOpposite5Cell(cell)
 
             # Then, check each side individually, even for cells that have no required sides.
             for side in cell.sides:
-                if side.isUnset():
+                if side.status == UNSET:
                     self.inspectObviousSideClues(side)
 
             # Also, check each limb
             for side in cell.limbs:
-                if side is not None and side.isUnset():
+                if side is not None and side.status == UNSET:
                     self.inspectObviousSideClues(side)
 
     def inspectLessObviousCellClues(self, cell):
-        """Inspect a given cell for less obvious clues."""
-        if not cell.isFullySet(memoize=True):
-            if len(self.nextMoveList) == 0:
-                self.inspectSymmetrical3Cell(cell)
-            if len(self.nextMoveList) == 0:
-                self.inspectUnsetSideLinks(cell)
-            if len(self.nextMoveList) == 0:
-                self.inspectTheoreticals(cell)
-            if len(self.nextMoveList) == 0:
-                self.inspectClosedOff5Cell(cell)
-            if len(self.nextMoveList) == 0:
-                self.inspectOpen5Cell(cell)
-            if len(self.nextMoveList) == 0:
-                self.inspectRemaining2Group(cell)
+        """Inspect a given cell for less obvious clues.
+        Stops at the first inspection that finds a move.
+
+        The cell is checked for being fully set once here. Since the inspections only queue
+        moves, it stays the same for all of them, so they don't check it again.
+        """
+        if cell.isFullySet(memoize=True):
+            return
+        nextMoveList = self.nextMoveList
+        for inspect in self._lessObviousInspections[cell.reqSides]:
+            if nextMoveList:
+                break
+            inspect(cell)
 
     def inspect4CellGroupOpposite5Cell(self, cell):
         """
@@ -300,55 +514,53 @@ class HexSolver:
 
         This applies recursively to the chain of 4-Cells from a 5-Cell.
         """
-        if cell.reqSides != 4 or cell.isFullySet(memoize=True):
+        if cell.reqSides != 4:
             return
 
         def hasUnset2LinkInDir(targetSide, adjSide1, adjSide2):
             """Returns true if the targetSide is unset and is linked to either one
             of the adjacent sides."""
-            if not targetSide.isUnset():
+            if targetSide.status != UNSET:
                 return False
             return targetSide.isLinkedTo(adjSide1) or targetSide.isLinkedTo(adjSide2)
 
         def processFourCell(fourCell, targetDir):
             """Check if the given 4-Cell has an unset link of size 2 in the given direction.
-            If none, recursively process the cell in the given direction if it is also a 4-Cell."""
-
-            # Base case
-            if fourCell is None or fourCell.reqSides != 4 or \
-                    not fourCell.sides[targetDir].isUnset():
-                return
-
-            # Get the relevant sides
-            targetSide = fourCell.sides[targetDir]
-            dir1, dir2 = targetDir.getAdjacentSides()
-            adjSide1 = fourCell.sides[dir1]
-            adjSide2 = fourCell.sides[dir2]
-
-            # If it has what we are looking for, set that side to ACTIVE and terminate recursion
-            if hasUnset2LinkInDir(targetSide, adjSide1, adjSide2):
-                msg = "Unset size-2 group of 4-Cell opposite a 5-Cell should be active."
-                self.addNextMove(fourCell.sides[targetDir], ACTIVE, NORMAL, msg)
-                return
-
-            # Check if the targetDir and its adjacent sides are UNSET
-            if targetSide.isUnset() and adjSide1.isUnset() and adjSide2.isUnset():
-                # If so, recursively process the next cell
-                processFourCell(fourCell.adjCells[targetDir], targetDir)
-
-        for cellDir in HexSideDir:
+            If none, continue with the cell in the given direction if it is also a 4-Cell."""
+            dir1, dir2 = SIDE_DIR_ADJACENT[targetDir]
+
+            # Walk the chain of 4-Cells in the target direction
+            while fourCell is not None and fourCell.reqSides == 4 and \
+                    fourCell.sides[targetDir].status == UNSET:
+
+                # Get the relevant sides
+                targetSide = fourCell.sides[targetDir]
+                adjSide1 = fourCell.sides[dir1]
+                adjSide2 = fourCell.sides[dir2]
+
+                # If it has what we are looking for, set that side to ACTIVE and stop
+                if hasUnset2LinkInDir(targetSide, adjSide1, adjSide2):
+                    msg = "Unset size-2 group of 4-Cell opposite a 5-Cell should be active."
+                    self.addNextMove(targetSide, ACTIVE, NORMAL, msg)
+                    return
+
+                # Only continue with the next cell if the adjacent sides are also UNSET
+                if adjSide1.status != UNSET or adjSide2.status != UNSET:
+                    return
+                fourCell = fourCell.adjCells[targetDir]
+
+        for cellDir, adjCell in enumerate(cell.adjCells):
             # If the 4-Cell has an adjacent 5-Cell
-            adjCell = cell.adjCells[cellDir]
             if adjCell is not None and adjCell.reqSides == 5:
-                processFourCell(cell, cellDir.opposite())
+                processFourCell(cell, SIDE_DIR_OPPOSITE[cellDir])
 
     def inspectSymmetrical3Cell(self, cell):
         """
         Inspects if the 3-Cell fits the symmetrical pattern, which is the case where
         all 3 active sides are linked.
         """
-        if cell.reqSides == 3 and not cell.isFullySet(memoize=True):
-            sideLinks = cell.getUnsetSideLinks(simple=False)
+        if cell.reqSides == 3:
+            sideLinks = self.getUnsetSideLinks(cell, simple=False)
             for sideLink in sideLinks:
                 # If a SideLink with len of 3 exists,
                 if len(sideLink) == 3:
@@ -360,10 +572,13 @@ class HexSolver:
                     self.addNextMove(limb1, ACTIVE, LOW, msg)
                     self.addNextMove(limb2, ACTIVE, LOW, msg)
                     # Set all other limbs to BLANK
+                    msg = "Remove all other limbs of symmetrical 3-Cell."
                     for limb in cell.limbs:
-                        if limb is not None and limb != limb1 and limb != limb2:
-                            msg = "Remove all other limbs of symmetrical 3-Cell."
+                        if limb is not None and limb is not limb1 and limb is not limb2:
                             self.addNextMove(limb, BLANK, LOW, msg)
+                    # The three sides of the link are all the active sides of the 3-Cell,
+                    # so there is no other link to look at
+                    return
 
     def inspectUnsetSideLinks(self, cell):
         """
@@ -372,17 +587,17 @@ class HexSolver:
         """
 
         # Don't process non-required cells
-        if cell.reqSides is not None and not cell.isFullySet(memoize=True):
-            unsetGroups = cell.getUnsetSideLinks()
+        if cell.reqSides is not None:
+            unsetGroups = self.getUnsetSideLinks(cell)
 
             # Get the actual count and the theoretical count of ACTIVE and BLANK sides
             actualActiveCount = cell.countActiveSides()
             actualBlankCount = cell.countBlankSides()
-            theoreticalCount, theoreticalSidesList = cell.getTheoreticalBlanks()
+            theoreticalCount, _, theoreticalMasks = self.getTheoreticalBlanks(cell)
             totalBlankCount = theoreticalCount + actualBlankCount
             totalActiveCount = theoreticalCount + actualActiveCount
 
-            for theoreticalSides in theoreticalSidesList:
+            for theoreticalMask in theoreticalMasks:
 
                 for group in unsetGroups:
                     groupSize = len(group)
@@ -391,35 +606,26 @@ class HexSolver:
                         continue
 
                     # Check if the group should be active
-                    if groupSize > cell.requiredBlanks() - actualBlankCount:
-                        msg = "Side group (size: {}) of {}-Cell should be active.".format(
-                            groupSize, cell.reqSides)
+                    if groupSize > cell.reqBlanks - actualBlankCount:
+                        msg = ("Side group (size: {}) of {}-Cell should be active.",
+                               (groupSize, cell.reqSides))
                         self.addNextMoves(group, ACTIVE, NORMAL, msg)
 
                     # Check if the group should be blank
                     elif groupSize > cell.reqSides - actualActiveCount:
-                        msg = "Side group (size: {}) of {}-Cell should be blank.".format(
-                            groupSize, cell.reqSides)
+                        msg = ("Side group (size: {}) of {}-Cell should be blank.",
+                               (groupSize, cell.reqSides))
                         self.addNextMoves(group, BLANK, NORMAL, msg)
 
                     # Check if all member sides of the group are not part of the theoretical sides
-                    else:
-                        allSidesNotInTheoretical = True
-                        for side in group:
-                            if side in theoreticalSides:
-                                allSidesNotInTheoretical = False
-                                break
-
-                        if allSidesNotInTheoretical:
-                            # Check the number of blanks/actives while considering theoreticals
-                            if groupSize > cell.requiredBlanks() - totalBlankCount:
-                                msg = f"Side group of {cell.reqSides}-Cell should be active " + \
-                                    "(using theoretical clues)."
-                                self.addNextMoves(group, ACTIVE, NORMAL, msg)
-                            elif groupSize > cell.reqSides - totalActiveCount:
-                                msg = f"Side group of {cell.reqSides}-Cell should be blank " + \
-                                    "(using theoretical clues)."
-                                self.addNextMoves(group, BLANK, NORMAL, msg)
+                    elif not cell.getSideMask(group) & theoreticalMask:
+                        # Check the number of blanks/actives while considering theoreticals
+                        if groupSize > cell.reqBlanks - totalBlankCount:
+                            msg = _MSG_GROUP_ACTIVE[cell.reqSides]
+                            self.addNextMoves(group, ACTIVE, NORMAL, msg)
+                        elif groupSize > cell.reqSides - totalActiveCount:
+                            msg = _MSG_GROUP_BLANK[cell.reqSides]
+                            self.addNextMoves(group, BLANK, NORMAL, msg)
 
     def inspectTheoreticals(self, cell):
         """
@@ -428,54 +634,45 @@ class HexSolver:
         If enough ACTIVE sides have been deduced, the remaining UNSET sides can be set to BLANK.
         """
 
-        if cell.reqSides is not None and not cell.isFullySet(memoize=True):
+        if cell.reqSides is not None:
             # Get the number of actual blank sides and actual active sides
             actualBlankCount = cell.countBlankSides()
             actualActiveCount = cell.countActiveSides()
             setSidesCount = actualActiveCount + actualBlankCount
 
-            theoreticalCount, theoreticalSidesList = cell.getTheoreticalBlanks()
+            theoreticalCount, theoreticalSidesList, theoreticalMasks = \
+                self.getTheoreticalBlanks(cell)
             theoreticalBlankCount = theoreticalCount
             theoreticalActiveCount = theoreticalCount
 
-            for theoreticalSides in theoreticalSidesList:
+            for theoreticalSides, theoreticalMask in zip(theoreticalSidesList, theoreticalMasks):
+                # The UNSET sides which are not theoretical blanks
+                unsureSides = cell.getUnsetSides(excludeMask=theoreticalMask)
 
                 # If we have enough blanks, the unsure sides are deduced to be ACTIVE
-                if theoreticalBlankCount + actualBlankCount == cell.requiredBlanks():
-                    for side in cell.sides:
-                        if side is not None and side.isUnset() and side not in theoreticalSides:
-                            msg = "Theoretical blanks plus actual blanks are enough. " + \
-                                "Set other sides to active."
-                            self.addNextMove(side, ACTIVE, LOW, msg)
+                if theoreticalBlankCount + actualBlankCount == cell.reqBlanks:
+                    for side in unsureSides:
+                        msg = "Theoretical blanks plus actual blanks are enough. " \
+                            "Set other sides to active."
+                        self.addNextMove(side, ACTIVE, LOW, msg)
 
                 # If we have enough actives, the unsure sides are deduced to be BLANK
                 if theoreticalActiveCount + actualActiveCount == cell.reqSides:
-                    for side in cell.sides:
-                        if side is not None and side.isUnset() and side not in theoreticalSides:
-                            msg = "Theoretical actives plus actual actives are enough. " + \
-                                "Set other sides to blank."
-                            self.addNextMove(side, BLANK, LOW, msg)
+                    for side in unsureSides:
+                        msg = "Theoretical actives plus actual actives are enough. " \
+                            "Set other sides to blank."
+                        self.addNextMove(side, BLANK, LOW, msg)
 
                 # If we need just 1 more active side
                 elif theoreticalActiveCount + actualActiveCount == cell.reqSides - 1:
                     # If there are only 2 remaining unsure sides
                     if len(theoreticalSides) + setSidesCount == len(cell.sides) - 2:
-                        # Check the remaining sides
-                        remainingUnsureDirs = []
-                        remainingUnsureSides = []
-                        for sideDir in HexSideDir:
-                            side = cell.sides[sideDir]
-                            if side is not None and side.isUnset() and side not in theoreticalSides:
-                                remainingUnsureDirs.append(sideDir)
-                                remainingUnsureSides.append(side)
-
-                        assert(len(remainingUnsureSides) == 2), \
+                        assert(len(unsureSides) == 2), \
                             "Expected only 2 remaining unsure sides."
 
                         # And if they are adjacent to each other, set the bisecting limb to ACTIVE
-                        if remainingUnsureDirs[0].isAdjacent(remainingUnsureDirs[1]):
-                            vtx = remainingUnsureSides[0].getConnectionVertex(
-                                remainingUnsureSides[1])
+                        vtx = unsureSides[0].getConnectionVertex(unsureSides[1])
+                        if vtx is not None:
                             limb = cell.getLimbAt(vtx)
                             self.addNextMove(limb, ACTIVE, LOW,
                                              "Bisect the remaining 2 unsure sides.")
@@ -486,7 +683,7 @@ class HexSolver:
         """
 
         # Don't perform this check if there are still other moves left
-        if len(self.nextMoveList) > 0:
+        if self.nextMoveList:
             return
 
         # Do nothing if a cell is fully set
@@ -495,114 +692,24 @@ class HexSolver:
 
         tempMemo = {}
 
-        # The direction of the two active sides that are part of the same loop
-        activesDirsList = [
-            (S_L, S_R),  # Compare to UL
-            (S_L, S_R),  # Compare to UR
-            (S_L, S_R),  # Compare to LL
-            (S_L, S_R),  # Compare to LR
-
-            (S_UL, S_LR),  # Compare to UR
-            (S_UL, S_LR),  # Compare to R
-            (S_UL, S_LR),  # Compare to LL
-            (S_UL, S_LR),  # Compare to L
-
-            (S_UR, S_LL),  # Compare to UL
-            (S_UR, S_LL),  # Compare to L
-            (S_UR, S_LL),  # Compare to R
-            (S_UR, S_LL)   # Compare to LR
-        ]
-
-        # The direction of the adjacent cell
-        adjCellDirList = [
-            S_UL,  # Compare to UL
-            S_UR,  # Compare to UR
-            S_LL,  # Compare to LL
-            S_LR,  # Compare to LR
-
-            S_UR,  # Compare to UR
-            S_R,  # Compare to R
-            S_LL,  # Compare to LL
-            S_L,  # Compare to L
-
-            S_UL,  # Compare to UL
-            S_L,  # Compare to L
-            S_R,  # Compare to R
-            S_LR  # Compare to LR
-        ]
-
-        # The direction of the unset dirs. First two values are for the cell,
-        # next two values are for the adjacent cell.
-        unsetDirsList = [
-            (S_UL, S_UR, S_LL, S_LR),  # Compare to UL
-            (S_UL, S_UR, S_LL, S_LR),  # Compare to UR
-            (S_LL, S_LR, S_UL, S_UR),  # Compare to LL
-            (S_LL, S_LR, S_UL, S_UR),  # Compare to LR
-
-            (S_UR, S_R, S_L, S_LL),  # Compare to UR
-            (S_UR, S_R, S_L, S_LL),  # Compare to R
-            (S_L, S_LL, S_R, S_UR),  # Compare to LL
-            (S_L, S_LL, S_R, S_UR),  # Compare to L
-
-            (S_UL, S_L, S_R, S_LR),  # Compare to UL
-            (S_UL, S_L, S_R, S_LR),  # Compare to L
-            (S_R, S_LR, S_UL, S_L),  # Compare to R
-            (S_R, S_LR, S_UL, S_L)  # Compare to LR
-        ]
-
-        # The side of the cell to activate if we have a face to face loop
-        activationList = [
-            S_UL,  # Compare to UL
-            S_UR,  # Compare to UR
-            S_LL,  # Compare to LL
-            S_LR,  # Compare to LR
-
-            S_UR,  # Compare to UR
-            S_R,  # Compare to R
-            S_LL,  # Compare to LL
-            S_L,  # Compare to L
-
-            S_UL,  # Compare to UL
-            S_L,  # Compare to L
-            S_R,  # Compare to R
-            S_LR  # Compare to LR
-        ]
-
-        # pylint: disable=consider-using-enumerate
-        for idx in range(len(activesDirsList)):
-            # Get the relevant directions
-            activeDirs = activesDirsList[idx]
-            adjCellDir = adjCellDirList[idx]
-            unsetDirs = unsetDirsList[idx]
+        for activeDirs, cellActiveSide1, cellActiveSide2, adjCellActiveSide1, \
+                adjCellActiveSide2, cellUnsetSide1, cellUnsetSide2, adjCellUnsetSide1, \
+                adjCellUnsetSide2, activateSide in self.getFaceToFaceCases(cell):
 
             # If the active dirs aren't active or not part of the same loop
             if activeDirs in tempMemo and not tempMemo[activeDirs]:
                 continue
 
-            adjCell = cell.adjCells[adjCellDir]
-            if adjCell is None:
-                continue
-
-            # Get the relevant sides
-            cellActiveSide1 = cell.sides[activeDirs[0]]
-            cellActiveSide2 = cell.sides[activeDirs[1]]
-            adjCellActiveSide1 = adjCell.sides[activeDirs[0]]
-            adjCellActiveSide2 = adjCell.sides[activeDirs[1]]
-            cellUnsetSide1 = cell.sides[unsetDirs[0]]
-            cellUnsetSide2 = cell.sides[unsetDirs[1]]
-            adjCellUnsetSide1 = adjCell.sides[unsetDirs[2]]
-            adjCellUnsetSide2 = adjCell.sides[unsetDirs[3]]
-
             # The four active sides should be active
-            if not cellActiveSide1.isActive() or not cellActiveSide2.isActive():
+            if cellActiveSide1.status != ACTIVE or cellActiveSide2.status != ACTIVE:
                 tempMemo[activeDirs] = False
                 continue
-            if not adjCellActiveSide1.isActive() or not adjCellActiveSide2.isActive():
+            if adjCellActiveSide1.status != ACTIVE or adjCellActiveSide2.status != ACTIVE:
                 continue
 
             # The four unset sides should be unset
-            if not cellUnsetSide1.isUnset() or not cellUnsetSide2.isUnset() or \
-                    not adjCellUnsetSide1.isUnset() or not adjCellUnsetSide2.isUnset():
+            if cellUnsetSide1.status != UNSET or cellUnsetSide2.status != UNSET or \
+                    adjCellUnsetSide1.status != UNSET or adjCellUnsetSide2.status != UNSET:
                 continue
 
             # Check if the active sides have the same color
@@ -612,25 +719,49 @@ class HexSolver:
 
             if activeDirs not in tempMemo:
                 # Check if the cell's active sides are part of the same loop
-                link = SideLink.fromSide(cellActiveSide1)
+                link = self.getLink(cellActiveSide1)
                 if cellActiveSide2 not in link.sides:
                     tempMemo[activeDirs] = False
                     continue
                 tempMemo[activeDirs] = True
 
             # Check if the adjacent cell's active sides are part of the same loop
-            link = SideLink.fromSide(adjCellActiveSide1)
+            link = self.getLink(adjCellActiveSide1)
             if adjCellActiveSide2 not in link.sides:
                 continue
 
             # If all of those checks have been passed, we have a face-to-face loop
             # so we should activate the relevant side.
-            activationDir = activationList[idx]
-            activateSide = cell.sides[activationDir]
             msg = "Avoid the face to face loop."
             self.addNextMove(activateSide, ACTIVE, LOWEST, msg)
             break  # If we found a valid case, no need to check others
 
+    def getFaceToFaceCases(self, cell):
+        """Returns the face-to-face loop cases of a given cell with the sides resolved.
+
+        Each case is a tuple of the active dirs, the two active sides of the cell,
+        the two active sides of the adjacent cell, the two unset sides of the cell,
+        the two unset sides of the adjacent cell, and the side to activate.
+        Cases without an adjacent cell are left out. The board geometry never changes,
+        so the cases are memoized per cell.
+        """
+        cases = self._memoFaceToFaceCases.get(cell.id)
+        if cases is None:
+            cases = []
+            for activeDirs, adjCellDir, unsetDirs, activationDir in FACE_TO_FACE_CASES:
+                adjCell = cell.adjCells[adjCellDir]
+                if adjCell is None:
+                    continue
+                cases.append((activeDirs,
+                              cell.sides[activeDirs[0]], cell.sides[activeDirs[1]],
+                              adjCell.sides[activeDirs[0]], adjCell.sides[activeDirs[1]],
+                              cell.sides[unsetDirs[0]], cell.sides[unsetDirs[1]],
+                              adjCell.sides[unsetDirs[2]], adjCell.sides[unsetDirs[3]],
+                              cell.sides[activationDir]))
+            cases = tuple(cases)
+            self._memoFaceToFaceCases[cell.id] = cases
+        return cases
+
     def inspectRemaining2Group(self, cell):
         """
         Inspect a cell if it only need 2 more active sides. Check if the remaining unset sides
@@ -640,7 +771,7 @@ class HexSolver:
         # If the cell needs 2 more active sides
         if cell.remainingReqs() == 2:
 
-            unsetSideLinks = cell.getUnsetSideLinks(simple=False)
+            unsetSideLinks = self.getUnsetSideLinks(cell, simple=False)
 
             links1 = []  # Links with size 1
             links2 = []  # Links with size 2
@@ -657,8 +788,7 @@ class HexSolver:
             # If there are of links whose size is greater than 2, they should be blank
             if len(otherLinks) > 0:
                 for link in otherLinks:
-                    msg = f"Side group of {cell.reqSides}-Cell should be blank " + \
-                        "(using theoretical clues)."
+                    msg = _MSG_GROUP_BLANK[cell.reqSides]
                     self.addNextMoves(link, BLANK, NORMAL, msg)
 
             # If there are two links with size of 1 and they are adjacent each other,
@@ -666,8 +796,7 @@ class HexSolver:
             elif len(links1) == 2 and links1[0].getConnectionVertex(links1[1]) is not None:
                 vertex = links1[0].getConnectionVertex(links1[1])
                 limb = cell.getLimbAt(vertex)
-                msg = "Remaining required sides of {}-Cell is 2, so fuse the two together.".format(
-                    cell.reqSides)
+                msg = _MSG_FUSE[cell.reqSides]
                 self.addNextMove(limb, BLANK, LOW, msg)
 
             # If there are two links with size of 2 and they are adjacent each other,
@@ -675,107 +804,83 @@ class HexSolver:
             elif len(links2) == 2 and links2[0].getConnectionVertex(links2[1]) is not None:
                 vertex = links2[0].getConnectionVertex(links2[1])
                 limb = cell.getLimbAt(vertex)
-                msg = "Remaining required sides of {}-Cell is 2, so bisect the two links.".format(
-                    cell.reqSides)
+                msg = _MSG_BISECT[cell.reqSides]
                 self.addNextMove(limb, ACTIVE, LOW, msg)
 
-    def inspectClosedOff5Cell(self, cell):
+    def inspect5CellNeighbors(self, cell):
         """
-        Inspect a 5-Cell if it is valid to close off its adjacent cells.
+        Inspect a 5-Cell if it is valid to close off or to open to each of its adjacent cells.
 
         A 5-Cell "closes off" an adjacent cell when all 3 sides
         connected to the adjacent cell are ACTIVE.
-        """
-
-        if cell.reqSides == 5 and not cell.isFullySet(memoize=True):
-
-            def isValidToCloseOff(adjCell, sideDir):
-                """Returns true if the given cell (the cell adjacent to the 5-Cell)
-                is fine with being closed off."""
-
-                # If the adjCell has no required sides, then it is okay to close this off
-                if adjCell.reqSides is None:
-                    return True
-
-                countBlank = adjCell.countBlankSides()
-
-                # The side bordering the adjCell and the 5-Cell (will become active)
-                borderSide = adjCell.sides[sideDir]
-
-                # The other sides of the adjCell that will become blank
-                otherSides = adjCell.getAllCellSidesConnectedToSide(borderSide)
-                for otherSide in otherSides:
-                    # If the otherSide is already active, it is invalid to close off this adjCell.
-                    if otherSide.isActive():
-                        return False
 
-                    if otherSide.isUnset():
-                        countBlank += 1
-
-                        # Consider the linked sides
-                        # (the link is sure to be UNSET because otherSide is UNSET)
-                        linkedSides = otherSide.getAllLinkedSides()
-                        for linkedSide in linkedSides:
-                            if linkedSide in adjCell.sides:
-                                countBlank += 1
+        A 5-Cell "opens" to an adjacent cell when the side between them is BLANK.
+        Checks if the adjacent cell is still valid after gaining two ACTIVE sides.
+        """
 
-                # If we have exceeded the number of required blank sides
-                if countBlank > adjCell.requiredBlanks():
-                    return False
+        if cell.reqSides != 5:
+            return
 
-                return True
+        def isValidToCloseOff(adjCell, sideDir):
+            """Returns true if the given cell (the cell adjacent to the 5-Cell)
+            is fine with being closed off."""
 
-            for sideDir in HexSideDir:
-                adjCell = cell.adjCells[sideDir]
-                if adjCell is not None:
-                    if not isValidToCloseOff(adjCell, sideDir.opposite()):
-                        cap, limbs = cell.getCap(sideDir.opposite())
-                        msg = f"The 5-Cell cannot close off the {str(sideDir)} direction."
-                        self.addNextMoves(cap, ACTIVE, LOW, msg)
-                        self.addNextMoves(limbs, BLANK, LOW, msg)
+            # The directions of the other sides of the adjCell that will become blank,
+            # which are the sides connected to the side bordering the adjCell and the 5-Cell
+            otherDirs = SIDE_DIR_ADJACENT[sideDir]
 
-    def inspectOpen5Cell(self, cell):
-        """
-        Inspect a 5-Cell if it is valid to set a side to BLANK.
+            # If an otherSide is already active, it is invalid to close off this adjCell.
+            if adjCell.activeMask & ((1 << otherDirs[0]) | (1 << otherDirs[1])):
+                return False
 
-        Checks if the cell adjacent to the 5-Cell in the direction of the BLANK
-        is still valid after gaining two ACTIVE sides.
-        """
+            countBlank = adjCell.countBlankSides()
+            for otherDir in otherDirs:
+                otherSide = adjCell.sides[otherDir]
+                if otherSide.status == UNSET:
+                    countBlank += 1
+
+                    # Consider the linked sides
+                    # (the link is sure to be UNSET because otherSide is UNSET)
+                    linkedSides = otherSide.getAllLinkedSides()
+                    for linkedSide in linkedSides:
+                        if linkedSide.id in adjCell.sideIds:
+                            countBlank += 1
+
+            # If we have exceeded the number of required blank sides
+            if countBlank > adjCell.reqBlanks:
+                return False
 
-        if cell.reqSides != 5 or cell.isFullySet(memoize=True):
-            return
+            return True
 
-        def getActiveSet(cell, targetDir):
-            """Returns a set of sides that will become (or already are) active.
+        def getActiveMask(cell, targetDir):
+            """Returns the side mask of the sides that will become (or already are) active.
             The targetDir is the side bordering the 5-Cell.\n
             Returns None if an invalid case is encountered.
             """
             # Add the already active sides
-            activeSet = set().union(filter(lambda side: side.isActive(), cell.sides))
+            activeMask = cell.activeMask
             # Get the sides adjacent the targetDir
-            adjSideDirs = targetDir.getAdjacentSides()
+            adjSideDirs = SIDE_DIR_ADJACENT[targetDir]
             for adjSideDir in adjSideDirs:
                 adjSide = cell.sides[adjSideDir]
                 # If the adjSide is BLANK, it is invalid
-                if adjSide.isBlank():
+                if adjSide.status == BLANK:
                     return None
                 # Add the adjSide and its whole side group
-                link = SideLink.fromSide(adjSide, filterFxn=lambda x: x in cell.sides)
-                activeSet.update(link.sides)
+                link = SideLink.fromSide(adjSide, filterFxn=lambda x: x.id in cell.sideIds)
+                activeMask |= cell.getSideMask(link.sides)
 
-            return activeSet
+            return activeMask
 
-        def hasAntiPairOppositeDir(cell, targetDir, activeSides):
+        def hasAntiPairOppositeDir(cell, targetDir, activeMask):
             """Returns true if the cell has an anti-pair opposite a given side.
-            The anti-pair must also not be already in the given activeSides set."""
-            vtx1, vtx2 = targetDir.opposite().connectedVertexDirs()
+            The anti-pair must also not be already in the given activeMask."""
+            vtx1, vtx2 = SIDE_DIR_VERTEX_DIRS[SIDE_DIR_OPPOSITE[targetDir]]
             antiPairs = (cell.getAntiPair(vtx1), cell.getAntiPair(vtx2))
             for antiPair in antiPairs:
                 if antiPair is not None:
-                    # Test if both sides of the pair are not in the activeSides
-                    sidesNotInActiveSides = antiPair.sides[0] not in activeSides \
-                        and antiPair.sides[1] not in activeSides
-                    if sidesNotInActiveSides:
+                    # Test if both sides of the pair are not in the activeMask
+                    if not activeMask & cell.getSideMask(antiPair.sides):
                         return True
             return False
 
@@ -786,17 +891,17 @@ class HexSolver:
             # The side bordering the targetCell and the 5-Cell (will become blank).
             # If it is already active, then obviously it cannot be opened.
             borderSide = targetCell.sides[sideDir]
-            if borderSide.isActive():
+            if borderSide.status == ACTIVE:
                 return False
 
-            # Set of sides that will become active (or are already active)
-            activeSides = getActiveSet(targetCell, sideDir)
-            if activeSides is None:
+            # Mask of sides that will become active (or are already active)
+            activeMask = getActiveMask(targetCell, sideDir)
+            if activeMask is None:
                 return False
-            countActive = len(activeSides)
+            countActive = MASK_COUNT[activeMask]
 
             # Check if the targetCell has anti-pairs opposite the 5-Cell
-            if hasAntiPairOppositeDir(targetCell, sideDir, activeSides):
+            if hasAntiPairOppositeDir(targetCell, sideDir, activeMask):
                 countActive += 1
 
             # If we have exceeded the number of required active sides
@@ -805,76 +910,104 @@ class HexSolver:
 
             return True
 
-        for sideDir in HexSideDir:
-            if cell.sides[sideDir].isUnset():
-                adjCell = cell.adjCells[sideDir]
-                if adjCell is not None and adjCell.reqSides is not None:
-                    if not isValidToOpen(adjCell, sideDir.opposite()):
-                        side = cell.sides[sideDir]
-                        print(cell, side)
-                        msg = f"The 5-Cell cannot be open in the {str(sideDir)} direction."
-                        self.addNextMove(side, ACTIVE, LOW, msg)
+        for sideDir, (side, adjCell) in enumerate(zip(cell.sides, cell.adjCells)):
+            # Cells without required sides are fine with being closed off or opened
+            if adjCell is None or adjCell.reqSides is None:
+                continue
+            # The direction of the side bordering the adjCell and the 5-Cell, from the adjCell
+            adjDir = SIDE_DIR_OPPOSITE[sideDir]
+            if not isValidToCloseOff(adjCell, adjDir):
+                cap, limbs = cell.getCap(adjDir)
+                msg = _MSG_CLOSE_OFF_5[sideDir]
+                self.addNextMoves(cap, ACTIVE, LOW, msg)
+                self.addNextMoves(limbs, BLANK, LOW, msg)
+            if side.status == UNSET and not isValidToOpen(adjCell, adjDir):
+                msg = _MSG_OPEN_5[sideDir]
+                self.addNextMove(side, ACTIVE, LOW, msg)
 
     ###########################################################################
     # FACTIONS
     ###########################################################################
 
     def inspectFactions(self):
-        """Inspect each cell's faction for clues."""
-
-        self.recalculateFactions()
+        """Inspect each cell's faction for clues.
 
-        for cell in self.game.cells:
-            # If faction is unknown, do nothing
-            if cell.isFactionUnknown():
-                continue
+        Only the cells whose faction became known since the last inspection are looked at.
+        A side between two known cells is looked at from whichever of them became known
+        last, so the cells that were already inspected have nothing new to give.
+        The known cells next to a side that was set back to UNSET (e.g. by undoing a move)
+        are looked at again, since that side is new to them.
+        """
 
+        self.recalculateFactions()
+        for side in self.game.popUnsetSides():
+            for cell in side.getAdjCells():
+                if not cell.isFactionUnknown():
+                    self.dirtyFactionCells[cell.id] = cell
+
+        dirtyCells = sorted(self.dirtyFactionCells.values(), key=lambda c: (c.row, c.col))
+        self.dirtyFactionCells = {}
+        processedSides = self.processedSides
+        outside = CellFaction.OUTSIDE
+        unknown = CellFaction.UNKNOWN
+        for cell in dirtyCells:
             # Look at each side
-            for sideDir in HexSideDir:
-                side = cell.sides[sideDir]
-                # If this side is unset, try to see if we can find out using faction clues
-                if side.isUnset():
-                    adjCell = cell.adjCells[sideDir]
-                    sideFaction = CellFaction.OUTSIDE if adjCell is None else adjCell.faction
+            for side, adjCell in zip(cell.sides, cell.adjCells):
+                # If this side is unset and not queued yet, try to see if we can find out
+                # using faction clues. Queued sides are skipped before building the message.
+                if side.status == UNSET and not processedSides[side.id]:
+                    sideFaction = outside if adjCell is None else adjCell.faction
+                    if sideFaction == unknown:
+                        continue
                     # If own faction and the adjacent cell's faction is different,
                     # set the side to ACTIVE
-                    if sideFaction != CellFaction.UNKNOWN and sideFaction != cell.faction:
-                        msg = "The cell at {} is {} so we separate it from {}.".format(
-                            str(cell), str(cell.faction),
-                            "the outside" if adjCell is None else str(adjCell))
+                    if sideFaction != cell.faction:
+                        msg = ("The cell at {} is {} so we separate it from {}.",
+                               (cell, cell.faction,
+                                "the outside" if adjCell is None else adjCell))
                         self.addNextMove(side, ACTIVE, LOWEST, msg)
                     # If own faction and the adjacent cell's faction is the same,
                     # set the side to BLANK
-                    elif sideFaction != CellFaction.UNKNOWN and sideFaction == cell.faction:
-                        msg = "The cell at {} is {} so we merge it with {}.".format(
-                            str(cell), str(cell.faction),
-                            "the outside" if adjCell is None else str(adjCell))
+                    else:
+                        msg = ("The cell at {} is {} so we merge it with {}.",
+                               (cell, cell.faction,
+                                "the outside" if adjCell is None else adjCell))
                         self.addNextMove(side, BLANK, LOWEST, msg)
 
     def resetFactions(self):
         """Reset all the factions to None."""
         for cell in self.game.cells:
             cell.setFactionUnknown()
+        self.dirtyFactionCells = {}
 
     def recalculateFactions(self):
         """Calculate each cell's faction."""
 
-        def setFaction(cell, newFaction):
-            """Sets the faction of the given cell, then recursively inform its
-            adjacent cells to update."""
+        def setFaction(startCell, startFaction):
+            """Sets the faction of the given cell, then inform its adjacent cells to update.
 
-            if cell.faction != newFaction and cell.isFactionUnknown():
+            The adjacent cells are walked depth-first with an explicit stack, in the
+            same order as a recursive walk would, without the recursion.
+            """
+            stack = [(startCell, startFaction)]
+            while stack:
+                cell, newFaction = stack.pop()
+                if cell.faction == newFaction or not cell.isFactionUnknown():
+                    continue
                 cell.setFaction(newFaction)
+                self.dirtyFactionCells[cell.id] = cell
 
-                # Notify its adjacent cells
-                for sideDir in HexSideDir:
-                    adjCell = cell.adjCells[sideDir]
+                # Notify its adjacent cells. They are pushed in reverse so that
+                # the first side's cell is handled first.
+                for side, adjCell in zip(reversed(cell.sides), reversed(cell.adjCells)):
+                    if adjCell is None:
+                        continue
                     # If the side is BLANK, set the adjacent cell to be the same
-                    if cell.sides[sideDir].isBlank() and adjCell is not None:
-                        setFaction(adjCell, newFaction)
+                    if side.status == BLANK:
+                        stack.append((adjCell, newFaction))
                     # If the side is ACTIVE, set the adjacent cell to be the opposite
-                    if cell.sides[sideDir].isActive() and adjCell is not None:
-                        setFaction(adjCell, newFaction.opposite())
+                    elif side.status == ACTIVE:
+                        stack.append((adjCell, newFaction.opposite()))
 
         def processEdgeCell(cell):
             """Given a cell on the edge of the game board,
@@ -886,20 +1019,19 @@ class HexSolver:
             if not cell.isFactionUnknown():
                 return
 
-            for sideDir in HexSideDir:
-                adjCell = cell.adjCells[sideDir]
+            for side, adjCell in zip(cell.sides, cell.adjCells):
                 # If adjacent cell is None, it is the outside of the board
                 if adjCell is None:
                     # If the side to the outside is BLANK, the cell is OUTSIDE
-                    if cell.sides[sideDir].isBlank():
+                    if side.status == BLANK:
                         setFaction(cell, CellFaction.OUTSIDE)
                     # If the side to the outside is ACTIVE, the cell is INSIDE
-                    elif cell.sides[sideDir].isActive():
+                    elif side.status == ACTIVE:
                         setFaction(cell, CellFaction.INSIDE)
                 elif not adjCell.isFactionUnknown():
-                    if cell.sides[sideDir].isBlank():
+                    if side.status == BLANK:
                         setFaction(cell, adjCell.faction)
-                    elif cell.sides[sideDir].isActive():
+                    elif side.status == ACTIVE:
                         setFaction(cell, adjCell.faction.opposite())
 
         rows = self.game.rows
@@ -925,26 +1057,34 @@ class HexSolver:
             side (HexSide): The side to be set.
             newStatus (SideStatus): The new status of the side.
             priority (MovePriority): The priority of the move.
-            msg (string): The explanation message of the move.
+            msg (string or tuple): The explanation message of the move. See `HexGameMove`.
         """
-        if side is not None and side.isUnset() and newStatus != UNSET and \
-                side.id not in self.processedSideIds:
+        # A side already queued once is never queued again
+        if side is not None and not self.processedSides[side.id] and \
+                side.status == UNSET and newStatus != UNSET:
             move = HexGameMove(side.id, newStatus, UNSET, priority, msg=msg, fromSolver=True)
-            self.nextMoveList.append(move)
-            self.processedSideIds.add(side.id)
+            self.pushNextMove(move)
+            self.processedSides[side.id] = 1
 
     def addNextMoves(self, sides, newStatus, priority, msg):
         """Add multiple `HexGameMoves` to the `nextMoveList`.
-        Uses `addNextMove(side, newStatus)` under the hood.
+        Applies the same checks as `addNextMove(side, newStatus)`.
 
         Args:
-            sides ([HexSide]): The list of sides to be set.
-            newStatus (SideStatus): The new status of all the sides in the list.
+            sides (iterable of HexSide): The sides to be set. Only iterated once.
+            newStatus (SideStatus): The new status of all the sides.
             priority (MovePriority): The priority of the move.
-            msg (string): The explanation message of the moves.
+            msg (string or tuple): The explanation message of the moves. See `HexGameMove`.
         """
+        if newStatus == UNSET:
+            return
+        processedSides = self.processedSides
+        pushNextMove = self.pushNextMove
         for side in sides:
-            self.addNextMove(side, newStatus, priority, msg)
+            if side is not None and not processedSides[side.id] and side.status == UNSET:
+                move = HexGameMove(side.id, newStatus, UNSET, priority, msg=msg, fromSolver=True)
+                pushNextMove(move)
+                processedSides[side.id] = 1
 
     def extendNextMoves(self, moves):
         """Add multiple `HexGameMoves` to the `nextMoveList`.
@@ -954,51 +1094,96 @@ class HexSolver:
         """
         for move in moves:
             side = self.game.sides[move.sideId]
-            if side.isUnset() and move.newStatus != UNSET:
-                if side.id not in self.processedSideIds:
-                    self.nextMoveList.append(move)
-                    self.processedSideIds.add(side.id)
+            if not self.processedSides[side.id]:
+                if side.status == UNSET and move.newStatus != UNSET:
+                    self.pushNextMove(move)
+                    self.processedSides[side.id] = 1
+
+    def pushNextMove(self, move):
+        """Push a `HexGameMove` into the `nextMoveList` heap. Moves with the same priority
+        are taken in the order they were pushed.
+
+        Args:
+            move (HexGameMove): The move to be pushed.
+        """
+        heappush(self.nextMoveList, (move.priority, self.moveCounter, move))
+        self.moveCounter += 1
+
+    def requeueMove(self, move):
+        """Put back a move that was taken from the `nextMoveList`, for example when it is undone.
+        It will be taken before the other moves with the same priority.
+
+        Args:
+            move (HexGameMove): The move to be put back.
+        """
+        self.requeueCounter -= 1
+        heappush(self.nextMoveList, (move.priority, self.requeueCounter, move))
 
     ###########################################################################
     # GET NEXT MOVE
     ###########################################################################
 
+    def popNearestMove(self, coords):
+        """Pop the move nearest to the given coordinates among the moves with the highest
+        priority from the `nextMoveList`. Ties are taken in the order they were added.
+
+        Args:
+            coords (Point): The coordinates to measure the distance from.
+        """
+        nextMoveList = self.nextMoveList
+        sides = self.game.sides
+        topPriority = nextMoveList[0][0]
+
+        nearestIdx = None
+        nearestKey = None
+        for idx, (priority, order, move) in enumerate(nextMoveList):
+            if priority == topPriority:
+                side = sides[move.sideId]
+                key = (hypot(side.midX - coords.x, side.midY - coords.y), order)
+                if nearestKey is None or key < nearestKey:
+                    nearestIdx = idx
+                    nearestKey = key
+
+        # Remove the nearest move and restore the heap
+        nearest = nextMoveList[nearestIdx]
+        last = nextMoveList.pop()
+        if nearestIdx < len(nextMoveList):
+            nextMoveList[nearestIdx] = last
+            heapify(nextMoveList)
+        return nearest[2]
+
     def getNextMove(self, prevCoords=None, doSort=True):
         """
-        Get the next correct move.
+        Get the next correct move. The moves with the highest priority are taken first.
 
         Args:
-            doSort (bool): If true, sort the list before returning the next move.
             prevCoords (Point): The coordinates of the previous move.
+            doSort (bool): If true and `prevCoords` is given, the move nearest to the
+                           previous move is taken among those with the highest priority.
+                           Otherwise, they are taken in the order they were added.
 
         Returns:
             GameMove: The next correct move.
         """
 
-        def sortKey(move):
-            sideCoords = self.game.sides[move.sideId].midpoint
-            dist = sideCoords.dist(prevCoords) if prevCoords is not None else 1
-            return (move.priority, dist)
+        nextMoveList = self.nextMoveList
+        sides = self.game.sides
+        nearest = doSort and prevCoords is not None
 
-        def getFromMoveList():
-            if len(self.nextMoveList) > 0:
-                if doSort:
-                    self.nextMoveList.sort(key=sortKey)
-                return self.nextMoveList.pop(0)
-            return None
+        for attempt in range(2):
+            # Get next move from list, but disregard if the side is not UNSET
+            while nextMoveList:
+                if nearest:
+                    nextMove = self.popNearestMove(prevCoords)
+                else:
+                    nextMove = heappop(nextMoveList)[2]
+                if sides[nextMove.sideId].status == UNSET:
+                    return nextMove
 
-        # Get next move from list, but disregard if the side is not UNSET
-        while True:
-            nextMove = getFromMoveList()
-            if nextMove is None:
+            # If there are no next moves,
+            # check everything and try to get next move again
+            if attempt > 0 or self.game.countSidesWithStatus(UNSET) == 0:
                 break
-            if self.game.sides[nextMove.sideId].isUnset():
-                return nextMove
-
-        # If there are no next moves,
-        # check everything and try to get next move again
-        if nextMove is None:
             self.inspectEverything()
-            return getFromMoveList()
 
         return None
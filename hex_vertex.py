@@ -5,14 +5,20 @@ from side_status import SideStatus
 from hex_dir import HexVertexDir
 from constants import COS_60, SQRT3
 
+ACTIVE = int(SideStatus.ACTIVE)
+
 
 class HexVertex:
     """A vertex of a HexCell."""
 
+    __slots__ = ("id", "sides", "coords", "nonBlankCount")
+
     def __init__(self, vertexId):
         self.id = vertexId
         self.sides = []
         self.coords = None
+        # The number of connected sides that are not BLANK. Kept up to date by the sides.
+        self.nonBlankCount = 0
 
     def isValid(self):
         """Returns true if this vertex is valid. Returns false otherwise.
@@ -29,28 +35,24 @@ class HexVertex:
 
     def isDead(self):
         """Returns true if all sides connected to this vertex is `BLANK`. False otherwise."""
-        return self.countBlankSides() == len(self.sides)
+        return self.nonBlankCount == 0
 
     def isDeadEnd(self):
         """Returns true if one side connected to this vertex is `ACTIVE`
         and all the rest are `BLANK`."""
-        return self.countActiveSides() == 1 and self.countBlankSides() == len(self.sides) - 1
+        return self.nonBlankCount == 1 and self.countActiveSides() == 1
 
     def countActiveSides(self):
         """Returns the number of `Sides` with `ACTIVE` status."""
         count = 0
         for side in self.sides:
-            if side.isActive():
+            if side.status == ACTIVE:
                 count += 1
         return count
 
     def countBlankSides(self):
         """Returns the number of `Sides` with `BLANK` status."""
-        count = 0
-        for side in self.sides:
-            if side.isBlank():
-                count += 1
-        return count
+        return len(self.sides) - self.nonBlankCount
 
     def getAllSidesExcept(self, exceptSideId):
         """Returns all the sides that are connected to this vertex, except a specified `Side`.
@@ -72,7 +74,7 @@ class HexVertex:
         """
         ret = []
         for side in self.sides:
-            if side.id != exceptSideId and side.status == SideStatus.ACTIVE:
+            if side.id != exceptSideId and side.status == ACTIVE:
                 ret.append(side)
         return ret
 
@@ -116,4 +118,4 @@ class HexVertex:
         return self.id == other.id
 
     def __hash__(self):
-        return hash(self.id)
+        return self.id
@@ -85,7 +85,7 @@ def undoOne(game, solver):
         reverseMove = prevMove.reverse()
         game.setSideStatus(reverseMove, appendToHistory=False)
         if prevMove.fromSolver:
-            solver.nextMoveList.insert(0, prevMove)
+            solver.requeueMove(prevMove)
 
 
 def reset(game, solver):
@@ -1,5 +1,12 @@
 """Side Link"""
 
+from side_status import SideStatus
+
+# Define SideStatus members
+UNSET = int(SideStatus.UNSET)
+ACTIVE = int(SideStatus.ACTIVE)
+BLANK = int(SideStatus.BLANK)
+
 
 class SideLink:
     """
@@ -59,7 +66,7 @@ class SideLink:
             2. When the side is ACTIVE and contains a loop.
         """
         # Blank sides cannot form a link
-        if side.isBlank():
+        if side.status == BLANK:
             return None
 
         # If the given side doesn't even pass the filter function, return None
@@ -118,7 +125,7 @@ class SideLink:
 
         # Check if the sides[0] is BLANK.
         # The other sides should be equal to sides[0].
-        if sides[0].isBlank():
+        if sides[0].status == BLANK:
             return False, None, None, None
 
         linkVertices = []
@@ -175,7 +182,7 @@ class SideLink:
         """
 
         # False if either side is None or Blank
-        if side1 is None or side2 is None or side1.isBlank() or side2.isBlank():
+        if side1 is None or side2 is None or side1.status == BLANK or side2.status == BLANK:
             return False
 
         # False if they are not the same status
@@ -206,21 +213,21 @@ class SideLink:
     def isUnset(self):
         """Returns true if all the sides in the link are unset. False otherwise."""
         for side in self.sides:
-            if not side.isUnset():
+            if side.status != UNSET:
                 return False
         return True
 
     def isActive(self):
         """Returns true if all the sides in the link are active. False otherwise."""
         for side in self.sides:
-            if not side.isActive():
+            if side.status != ACTIVE:
                 return False
         return True
 
     def isBlank(self):
         """Returns true if all the sides in the link are blank. False otherwise."""
         for side in self.sides:
-            if not side.isBlank():
+            if side.status != BLANK:
                 return False
         return True
 